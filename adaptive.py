@@ -0,0 +1,161 @@
+"""
+Adaptive output caps learned from observed output lengths
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+# Trailing chatter that follows a finished summary
+DEFAULT_STOP_SEQUENCES = {
+    'basic_summary': ["\n\nNote:", "\n\nLet me know"],
+    'one_sentence_summary': ["\n\nNote:", "\n\nLet me know"],
+    'short_summary': ["\n\nNote:", "\n\nLet me know"],
+    'structured_summary': ["\n\nLet me know"],
+    'personalized_summary': ["\n\nNote:", "\n\nLet me know"],
+    'simplified_summary': ["\n\nLet me know"],
+    'topic_focused_summary': ["\n\nNote:", "\n\nLet me know"],
+}
+
+
+class OutputTokenStats:
+    """
+    Tracks output-token counts per summary method and model, and derives a
+    max_tokens cap from a high percentile of that history
+    """
+
+    def __init__(self, percentile: float = 95.0, headroom: float = 1.2,
+                 min_samples: int = 20, history: int = 500, floor: int = 64,
+                 path: Optional[str] = None):
+        """
+        Initialize the tracker
+
+        Args:
+            percentile: Percentile of observed output lengths used for the cap
+            headroom: Multiplier applied on top of the percentile
+            min_samples: Observations needed before the cap adapts
+            history: Most recent observations kept per method and model
+            floor: Smallest cap ever returned
+            path: JSON file to load history from and save it to (optional);
+                several processes may share it
+        """
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.history = history
+        self.floor = floor
+        self.path = Path(path) if path else None
+        self._samples = {}
+        # Samples recorded since the last save, merged into the file on save
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        if self.path:
+            for key, values in self._load(self.path).items():
+                self._samples[key] = deque(values, maxlen=history)
+
+    @staticmethod
+    def _load(path: Path) -> dict:
+        """Saved history, or an empty dict if missing or unreadable"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {key: [int(v) for v in values if isinstance(v, (int, float))]
+                for key, values in data.items() if isinstance(values, list)}
+
+    @staticmethod
+    def _key(summary_type: str, model_id: str) -> str:
+        return f"{model_id}/{summary_type}"
+
+    def record(self, summary_type: str, model_id: str, output_tokens: int):
+        """
+        Record the output length of a completed summary
+
+        Args:
+            summary_type: Summary method name
+            model_id: Bedrock model ID
+            output_tokens: Tokens generated, including continuations
+        """
+        key = self._key(summary_type, model_id)
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.history))
+            samples.append(int(output_tokens))
+            self._pending.setdefault(key, []).append(int(output_tokens))
+
+    def max_tokens(self, summary_type: str, model_id: str, default: int) -> int:
+        """
+        Output cap for the next call
+
+        Args:
+            summary_type: Summary method name
+            model_id: Bedrock model ID
+            default: Static cap, used until enough history exists and never exceeded
+
+        Returns:
+            Cap for max_tokens
+        """
+        with self._lock:
+            samples = list(self._samples.get(self._key(summary_type, model_id), ()))
+        if len(samples) < self.min_samples:
+            return default
+
+        cap = math.ceil(np.percentile(samples, self.percentile) * self.headroom)
+        return int(min(default, max(self.floor, cap)))
+
+    def save(self, path: Optional[str] = None):
+        """
+        Persist observed history as JSON
+
+        Samples recorded since the last save are merged into the history
+        already on disk under a file lock, so concurrent runs sharing the
+        file keep each other's samples. The file is replaced atomically.
+
+        Args:
+            path: Output file (defaults to the path given at construction)
+        """
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No path given for output token history")
+
+        with self._lock, open(f"{target}.lock", 'a', encoding='utf-8') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                merged = {key: deque(values, maxlen=self.history)
+                          for key, values in self._load(target).items()}
+                for key, values in self._pending.items():
+                    merged.setdefault(key, deque(maxlen=self.history)).extend(values)
+
+                fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump({key: list(values) for key, values in merged.items()}, f)
+                    os.replace(tmp_path, target)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+            self._pending = {}
+            if target == self.path:
+                # Pick up samples other runs saved since this one started
+                self._samples = merged
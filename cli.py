@@ -3,9 +3,97 @@ Command-line interface for document summarization
 """
 
 import click
+import cProfile
 import json
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from summarizer import DocumentSummarizer
+from extractive import ExtractiveCompressor
+from governor import DEFAULT_LEDGER_PATH, BudgetGovernor, FileLedgerStore
+from sharding import (REPORT_NAME, find_shard_reports, iter_documents, iter_shard,
+                      merge_shards, parse_shard, report_name, shard_problems)
+from digest import CorpusDigest
+from tracing import Tracer
+from delta import DeltaSummarizer
+from adaptive import OutputTokenStats
+
+
+def load_config(path):
+    """Load the JSON configuration file (built-in defaults when path is None)"""
+    if path is None:
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def build_summarizer(cfg, tracer=None):
+    """Create a DocumentSummarizer from configuration"""
+    compression = cfg.get('compression', {})
+    compressor = None
+    if compression.get('enabled'):
+        compressor = ExtractiveCompressor(
+            ratios=compression.get('ratios'),
+            method=compression.get('method', 'tfidf'),
+            token_budget=compression.get('token_budget')
+        )
+    
+    limits = cfg.get('rate_limits', {})
+    governor = None
+    if limits.get('enabled'):
+        governor = BudgetGovernor(
+            requests_per_minute=limits['requests_per_minute'],
+            tokens_per_minute=limits['tokens_per_minute'],
+            store=FileLedgerStore(limits.get('ledger_path') or DEFAULT_LEDGER_PATH),
+            reserve_fraction=limits.get('reserve_fraction', 0.2)
+        )
+    
+    adaptive = cfg.get('adaptive_output', {})
+    output_stats = None
+    if adaptive.get('enabled'):
+        output_stats = OutputTokenStats(
+            percentile=adaptive.get('percentile', 95.0),
+            headroom=adaptive.get('headroom', 1.2),
+            min_samples=adaptive.get('min_samples', 20),
+            path=adaptive.get('history_path')
+        )
+    
+    return DocumentSummarizer(
+        region=cfg.get('region', 'us-east-1'),
+        model_id=cfg.get('model_id'),
+        compressor=compressor,
+        governor=governor,
+        priority=limits.get('priority', 'normal'),
+        tracer=tracer,
+        output_stats=output_stats,
+        stop_sequences=adaptive.get('stop_sequences'),
+        max_continuations=adaptive.get('max_continuations', 2),
+        max_retries=limits.get('max_retries', 3)
+    )
+
+
+def save_output_stats(summarizer):
+    """Persist learned output lengths if a history file is configured"""
+    stats = summarizer.output_stats
+    if stats is not None and stats.path is not None:
+        stats.save()
+
+
+@contextmanager
+def profiling(prefix, tracer):
+    """Run a block under cProfile and export its trace on exit"""
+    if not prefix:
+        yield
+        return
+    
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{prefix}.prof")
+        tracer.export_chrome_trace(f"{prefix}.trace.json")
+        click.echo(f"✓ Profile saved to {prefix}.prof and {prefix}.trace.json")
 
 
 @click.group()
@@ -34,15 +122,9 @@ def cli():
 def summarize(input, type, sections, role, level, output, config):
     """Generate a summary of the input document"""
     
-    # Load configuration
-    with open(config, 'r') as f:
-        cfg = json.load(f)
-    
-    # Initialize summarizer
-    summarizer = DocumentSummarizer(
-        region=cfg.get('region', 'us-east-1'),
-        model_id=cfg.get('model_id')
-    )
+    # Load configuration and initialize summarizer
+    cfg = load_config(config)
+    summarizer = build_summarizer(cfg)
     
     # Read input document
     with open(input, 'r', encoding='utf-8') as f:
@@ -67,6 +149,8 @@ def summarize(input, type, sections, role, level, output, config):
     elif type == 'simplified':
         summary = summarizer.simplified_summary(document, level)
     
+    save_output_stats(summarizer)
+    
     # Output results
     click.echo("\n" + "="*80)
     click.echo("SUMMARY")
@@ -80,6 +164,16 @@ def summarize(input, type, sections, role, level, output, config):
         click.echo(f"\n✓ Summary saved to {output}")
 
 
+def parse_shard_option(ctx, param, value):
+    """Validate the --shard option"""
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 @cli.command()
 @click.option('--input-dir', '-i', required=True, type=click.Path(exists=True),
               help='Directory containing documents to summarize')
@@ -88,37 +182,169 @@ def summarize(input, type, sections, role, level, output, config):
 @click.option('--type', '-t', default='short',
               type=click.Choice(['basic', 'one-sentence', 'short']),
               help='Type of summary to generate')
-def batch(input_dir, output_dir, type):
+@click.option('--config', '-c', default=None, type=click.Path(exists=True),
+              help='Configuration file path (optional; built-in defaults otherwise)')
+@click.option('--shard', default=None, callback=parse_shard_option,
+              help='Process only shard i of N (e.g. 0/4)')
+@click.option('--recursive', '-R', is_flag=True,
+              help='Search subdirectories for documents')
+@click.option('--profile', default=None, type=click.Path(),
+              help='Write PROFILE.trace.json (Chrome/Perfetto) and PROFILE.prof (cProfile)')
+@click.option('--trace-sample-rate', default=1.0, show_default=True,
+              type=click.FloatRange(0, 1),
+              help='Fraction of documents traced when profiling')
+@click.option('--state-dir', default=None, type=click.Path(file_okay=False),
+              help='Keep previous text/summary here and revise summaries from edits')
+@click.option('--max-change', default=0.3, show_default=True,
+              type=click.FloatRange(0, 1),
+              help='Largest changed fraction revised incrementally (with --state-dir)')
+def batch(input_dir, output_dir, type, config, shard, recursive, profile,
+          trace_sample_rate, state_dir, max_change):
     """Process multiple documents in batch"""
     
     input_path = Path(input_dir)
     output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    tracer = Tracer(sample_rate=trace_sample_rate) if profile else None
+    summarizer = build_summarizer(load_config(config), tracer=tracer)
+    updater = None
+    if state_dir:
+        updater = DeltaSummarizer(summarizer, state_dir, max_change_ratio=max_change)
+    method = {
+        'basic': 'basic_summary',
+        'one-sentence': 'one_sentence_summary',
+        'short': 'short_summary'
+    }[type]
     
-    summarizer = DocumentSummarizer()
+    def span(name):
+        return tracer.span(name) if tracer else nullcontext()
     
-    # Process all text files
-    text_files = list(input_path.glob('*.txt'))
+    # Discover text files lazily, keeping only this node's shard
+    index, count = shard or (0, 1)
+    text_files = iter_shard(input_path, index, count, recursive=recursive)
+    results = []
     
-    with click.progressbar(text_files, label='Processing documents') as files:
+    with profiling(profile, tracer), \
+            click.progressbar(text_files, label='Processing documents') as files:
         for file_path in files:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                document = f.read()
+            relative = file_path.relative_to(input_path)
+            traced = tracer.document(relative.as_posix()) if tracer else nullcontext()
             
-            # Generate summary
-            if type == 'basic':
-                summary = summarizer.basic_summary(document)
-            elif type == 'one-sentence':
-                summary = summarizer.one_sentence_summary(document)
-            else:
-                summary = summarizer.short_summary(document)
-            
-            # Save summary
-            output_file = output_path / f"{file_path.stem}_summary.txt"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(summary)
+            try:
+                with traced:
+                    with span('read'):
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            document = f.read()
+                    
+                    # Generate summary (revising the previous one if tracked)
+                    mode = 'full'
+                    if updater is not None:
+                        update = updater.update(relative.as_posix(), document, method)
+                        summary, mode = update['summary'], update['mode']
+                    else:
+                        summary = getattr(summarizer, method)(document)
+                    
+                    # Save summary, mirroring the input tree
+                    with span('write'):
+                        output_name = relative.parent / f"{file_path.stem}_summary.txt"
+                        output_file = output_path / output_name
+                        output_file.parent.mkdir(parents=True, exist_ok=True)
+                        with open(output_file, 'w', encoding='utf-8') as f:
+                            f.write(summary)
+                
+                results.append({
+                    'file': relative.as_posix(),
+                    'status': 'success',
+                    'mode': mode,
+                    'output': output_name.as_posix()
+                })
+                
+            except Exception as e:
+                click.echo(f"\nError processing {relative}: {str(e)}", err=True)
+                results.append({
+                    'file': relative.as_posix(),
+                    'status': 'error',
+                    'error': str(e)
+                })
+    
+    save_output_stats(summarizer)
+    
+    # Save processing report
+    report_file = output_path / report_name(index, count)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
     
-    click.echo(f"\n✓ Processed {len(text_files)} documents")
+    click.echo(f"\n✓ Processed {len(results)} documents")
+    click.echo(f"✓ Report saved to {report_file}")
+
+
+@cli.command()
+@click.argument('shard_dirs', nargs=-1, required=True,
+                type=click.Path(exists=True, file_okay=False))
+@click.option('--output-dir', '-o', required=True, type=click.Path(),
+              help='Directory for merged summaries and report')
+@click.option('--allow-incomplete', is_flag=True,
+              help='Merge even if shards are missing, duplicated or inconsistent')
+def merge(shard_dirs, output_dir, allow_incomplete):
+    """Merge outputs and reports written by sharded batch runs"""
+    
+    problems = shard_problems(find_shard_reports(shard_dirs))
+    if problems and not allow_incomplete:
+        raise click.ClickException(
+            "Incomplete shard set: " + "; ".join(problems)
+            + " (use --allow-incomplete to merge anyway)"
+        )
+    for problem in problems:
+        click.echo(f"WARNING: {problem}", err=True)
+    
+    results = merge_shards(shard_dirs, output_dir, allow_incomplete=True)
+    failed = sum(1 for r in results if r['status'] != 'success')
+    
+    click.echo(f"✓ Merged {len(results)} documents ({failed} failed)")
+    click.echo(f"✓ Report saved to {Path(output_dir) / REPORT_NAME}")
+
+
+@cli.command()
+@click.option('--input-dir', '-i', required=True, type=click.Path(exists=True),
+              help='Directory containing documents to digest')
+@click.option('--clusters', '-k', default=None, type=int,
+              help='Number of clusters (defaults to sqrt(documents / 2), at most 20)')
+@click.option('--representatives', default=3, show_default=True,
+              help='Documents summarized per cluster')
+@click.option('--workers', default=4, show_default=True,
+              help='Parallel cluster summary calls')
+@click.option('--recursive', '-R', is_flag=True,
+              help='Search subdirectories for documents')
+@click.option('--output', '-o', default=None, type=click.Path(),
+              help='Output file path for the digest (optional)')
+@click.option('--config', '-c', default='config.json', type=click.Path(exists=True),
+              help='Configuration file path')
+def digest(input_dir, clusters, representatives, workers, recursive, output, config):
+    """Cluster a corpus and summarize it into one digest"""
+    
+    summarizer = build_summarizer(load_config(config))
+    
+    paths = list(iter_documents(input_dir, recursive=recursive))
+    documents = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            documents.append(f.read())
+    
+    click.echo(f"Clustering {len(documents)} documents...")
+    builder = CorpusDigest(summarizer, n_clusters=clusters,
+                           representatives=representatives, max_workers=workers)
+    result = builder.digest(documents)
+    
+    click.echo("\n" + "="*80)
+    click.echo(f"DIGEST ({len(result['clusters'])} topics)")
+    click.echo("="*80 + "\n")
+    click.echo(result['digest'])
+    
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(result['digest'])
+        click.echo(f"\n✓ Digest saved to {output}")
 
 
 if __name__ == '__main__':
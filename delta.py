@@ -0,0 +1,153 @@
+"""
+Delta re-summarization for documents that receive small, frequent edits
+Input tokens scale with the size of the edit rather than the document
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Tuple
+
+from summarizer import DocumentSummarizer
+from text_utils import split_paragraphs
+
+
+# Summary methods that take only the document
+DELTA_METHODS = ('basic_summary', 'one_sentence_summary', 'short_summary')
+
+
+def paragraph_diff(old: str, new: str) -> Tuple[List[str], List[str], float]:
+    """
+    Paragraph-level diff of two versions of a document
+
+    Args:
+        old: Previous document text
+        new: Updated document text
+
+    Returns:
+        Tuple of (removed paragraphs, added paragraphs, change ratio), where
+        the change ratio is the share of characters in changed paragraphs
+    """
+    old_paras = split_paragraphs(old)
+    new_paras = split_paragraphs(new)
+    matcher = difflib.SequenceMatcher(None, old_paras, new_paras, autojunk=False)
+
+    removed, added = [], []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op != 'equal':
+            removed.extend(old_paras[i1:i2])
+            added.extend(new_paras[j1:j2])
+
+    total = sum(map(len, old_paras)) + sum(map(len, new_paras))
+    changed = sum(map(len, removed)) + sum(map(len, added))
+    return removed, added, (changed / total if total else 0.0)
+
+
+class DeltaSummarizer:
+    """
+    Keeps the previous text and summary of each document and revises the
+    summary from the changed paragraphs when an update is small
+    """
+
+    def __init__(self, summarizer: DocumentSummarizer, state_dir: str,
+                 max_change_ratio: float = 0.3, max_consecutive_deltas: int = 10):
+        """
+        Initialize the delta summarizer
+
+        Args:
+            summarizer: Summarizer used for model calls
+            state_dir: Directory storing previous text and summary per document
+            max_change_ratio: Largest change ratio revised incrementally;
+                bigger edits trigger a full summary
+            max_consecutive_deltas: Force a full summary after this many
+                incremental revisions to stop drift from accumulating
+        """
+        self.summarizer = summarizer
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.max_change_ratio = max_change_ratio
+        self.max_consecutive_deltas = max_consecutive_deltas
+
+    def _state_file(self, doc_id: str, summary_type: str) -> Path:
+        key = hashlib.sha1(f"{summary_type}\n{doc_id}".encode('utf-8')).hexdigest()
+        return self.state_dir / f"{key}.json"
+
+    def _load_state(self, state_file: Path):
+        """Previous state, or None if missing, unreadable or from another model"""
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(state, dict)
+                or not isinstance(state.get('text'), str)
+                or not isinstance(state.get('summary'), str)
+                or state.get('model_id') != self.summarizer.model_id):
+            return None
+        return state
+
+    def _save_state(self, state_file: Path, state: dict):
+        """Write state atomically so an interrupted run cannot corrupt it"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, state_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def update(self, doc_id: str, document: str,
+               summary_type: str = 'short_summary') -> dict:
+        """
+        Summarize a new version of a document, reusing the previous summary
+
+        Args:
+            doc_id: Stable identifier of the document (e.g. its path)
+            document: Current text content
+            summary_type: Summary method name (basic, one-sentence or short)
+
+        Returns:
+            Dict with "summary", "mode" ("full", "delta" or "unchanged") and
+            "change_ratio"
+        """
+        if summary_type not in DELTA_METHODS:
+            raise ValueError(f"Unsupported summary type for updates: {summary_type}")
+
+        state_file = self._state_file(doc_id, summary_type)
+        previous = self._load_state(state_file)
+
+        mode, change_ratio = 'full', 1.0
+        if previous is not None:
+            removed, added, change_ratio = paragraph_diff(previous['text'], document)
+            if not removed and not added:
+                return {'summary': previous['summary'], 'mode': 'unchanged',
+                        'change_ratio': 0.0}
+            if (change_ratio <= self.max_change_ratio
+                    and previous.get('deltas', 0) < self.max_consecutive_deltas):
+                mode = 'delta'
+
+        if mode == 'delta':
+            prompt = self.summarizer.templates.revise_summary(
+                previous['summary'], removed, added
+            )
+            summary = self.summarizer._invoke_model(
+                prompt,
+                max_tokens=self.summarizer.MAX_TOKENS.get(summary_type, 1024)
+            )
+        else:
+            summary = getattr(self.summarizer, summary_type)(document)
+
+        self._save_state(state_file, {
+            'doc_id': doc_id,
+            'summary_type': summary_type,
+            'model_id': self.summarizer.model_id,
+            'text': document,
+            'summary': summary,
+            'deltas': previous.get('deltas', 0) + 1 if mode == 'delta' else 0
+        })
+
+        return {'summary': summary, 'mode': mode, 'change_ratio': change_ratio}
@@ -0,0 +1,269 @@
+"""
+Role and reading-level views derived from one cached base summary
+The full document is sent once; each audience view reads the shorter base
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from prompt_templates import RoleTemplates
+from summarizer import DocumentSummarizer
+from text_utils import estimate_tokens, text_similarity
+
+
+DEFAULT_READING_LEVELS = ['third-grader', 'high school student', 'non-specialist adult']
+
+
+class DerivedViewSummarizer:
+    """
+    Generates audience-specific summaries from a cached detailed base summary
+    """
+
+    def __init__(self, summarizer: DocumentSummarizer,
+                 cache_dir: Optional[str] = None):
+        """
+        Initialize the derived-view summarizer
+
+        Args:
+            summarizer: Summarizer used for model calls
+            cache_dir: Directory persisting base summaries (optional; an
+                in-memory cache is always used)
+        """
+        self.summarizer = summarizer
+        self.templates = summarizer.templates
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _key(self, document: str) -> str:
+        """Cache key for a document under the current model"""
+        content = f"{self.summarizer.model_id}\n{document}".encode('utf-8')
+        return hashlib.sha256(content).hexdigest()
+
+    def _generate_base(self, document: str) -> Tuple[str, bool]:
+        """Generate the base summary, reporting whether it hit the output cap"""
+        max_tokens = self.summarizer.MAX_TOKENS['detailed_base_summary']
+        prompt = self.templates.detailed_base_summary(document)
+        response_body = self.summarizer._call_model(
+            [{"role": "user", "content": prompt}], max_tokens, 0.7
+        )
+        content = response_body.get('content') or [{'text': ''}]
+        truncated = response_body.get('stop_reason') == 'max_tokens'
+        if truncated:
+            warnings.warn(f"Base summary stopped at max_tokens ({max_tokens}); "
+                          "derived views may miss content from the document")
+        return content[0]['text'], truncated
+
+    def _store_base(self, document: str, summary: str, truncated: bool):
+        """Cache a base summary in memory and, if configured, on disk"""
+        key = self._key(document)
+        if self.cache_dir:
+            # Write atomically so an interrupted run cannot corrupt the cache
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'model_id': self.summarizer.model_id,
+                               'summary': summary, 'truncated': truncated}, f)
+                os.replace(tmp_path, self.cache_dir / f"{key}.json")
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        with self._lock:
+            self._cache[key] = {'summary': summary, 'truncated': truncated}
+
+    def _load_base(self, cache_file: Path) -> Optional[dict]:
+        """Cached base summary, or None if missing, unreadable or malformed"""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or not isinstance(cached.get('summary'), str):
+            return None
+        return {'summary': cached['summary'],
+                'truncated': bool(cached.get('truncated', False))}
+
+    def base_info(self, document: str) -> dict:
+        """
+        Detailed base summary of the document (generated once, then cached)
+
+        Args:
+            document: Text content to summarize
+
+        Returns:
+            Dict with the "summary" and whether it was "truncated" at max_tokens
+        """
+        key = self._key(document)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+
+        info = self._load_base(self.cache_dir / f"{key}.json") if self.cache_dir else None
+        if info is not None:
+            with self._lock:
+                self._cache[key] = info
+            return info
+
+        self._store_base(document, *self._generate_base(document))
+        with self._lock:
+            return self._cache[key]
+
+    def base_summary(self, document: str) -> str:
+        """
+        Detailed base summary of the document (generated once, then cached)
+
+        Args:
+            document: Text content to summarize
+
+        Returns:
+            Detailed summary
+        """
+        return self.base_info(document)['summary']
+
+    def personalized_summary(self, document: str, role: str,
+                             focus: Optional[str] = None) -> str:
+        """
+        Role-specific summary derived from the base summary
+
+        Args:
+            document: Text content to summarize
+            role: Target role (e.g., "financial analyst", "CTO")
+            focus: Specific areas to focus on (optional)
+
+        Returns:
+            Role-specific summary
+        """
+        prompt = self.templates.personalized_from_summary(
+            self.base_summary(document), role, focus
+        )
+        return self.summarizer._invoke_model(prompt)
+
+    def simplified_summary(self, document: str,
+                           reading_level: str = "third-grader") -> str:
+        """
+        Reading-level summary derived from the base summary
+
+        Args:
+            document: Text content to summarize
+            reading_level: Target reading level
+
+        Returns:
+            Simplified summary
+        """
+        prompt = self.templates.simplified_from_summary(
+            self.base_summary(document), reading_level
+        )
+        return self.summarizer._invoke_model(prompt)
+
+    def fan_out(self, document: str, roles: Optional[List[dict]] = None,
+                reading_levels: Optional[List[str]] = None,
+                max_workers: int = 4) -> dict:
+        """
+        Generate every role and reading-level view of a document
+
+        Args:
+            document: Text content to summarize
+            roles: Role templates ({"role", "focus"}), defaults to RoleTemplates.all()
+            reading_levels: Reading levels, defaults to DEFAULT_READING_LEVELS
+            max_workers: Parallel view calls
+
+        Returns:
+            Dict with "roles" and "reading_levels" mappings to summaries, and
+            "base_truncated" if the base summary hit its output cap
+        """
+        roles = RoleTemplates.all() if roles is None else roles
+        levels = DEFAULT_READING_LEVELS if reading_levels is None else reading_levels
+
+        # Produce the base once before fanning out
+        base = self.base_info(document)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            role_views = pool.map(
+                lambda r: self.personalized_summary(document, r['role'], r.get('focus')),
+                roles
+            )
+            level_views = pool.map(
+                lambda level: self.simplified_summary(document, level), levels
+            )
+            return {
+                'roles': dict(zip((r['role'] for r in roles), role_views)),
+                'reading_levels': dict(zip(levels, level_views)),
+                'base_truncated': base['truncated']
+            }
+
+    def fidelity(self, document: str, roles: Optional[List[dict]] = None,
+                 reading_levels: Optional[List[str]] = None) -> List[dict]:
+        """
+        Compare derived views against full-document generation
+
+        Args:
+            document: Text content to summarize
+            roles: Role templates to check, defaults to RoleTemplates.all()
+            reading_levels: Reading levels to check, defaults to DEFAULT_READING_LEVELS
+
+        Returns:
+            A first "base" record with the input tokens and latency of the
+            full-document call that produces the base summary, then one
+            record per view with similarity to the full-document output,
+            estimated input tokens and latency for both modes, and the
+            derived cost including an equal share of the base call
+        """
+        roles = RoleTemplates.all() if roles is None else roles
+        levels = DEFAULT_READING_LEVELS if reading_levels is None else reading_levels
+        document_tokens = estimate_tokens(document)
+
+        # Time a fresh base call so its cost is not hidden by the cache
+        start = time.perf_counter()
+        base_summary, truncated = self._generate_base(document)
+        base_seconds = time.perf_counter() - start
+        self._store_base(document, base_summary, truncated)
+        base_tokens = estimate_tokens(base_summary)
+
+        views = [('role', r['role'],
+                  lambda r=r: self.summarizer.personalized_summary(document, r['role'], r.get('focus')),
+                  lambda r=r: self.personalized_summary(document, r['role'], r.get('focus')))
+                 for r in roles]
+        views += [('reading_level', level,
+                   lambda level=level: self.summarizer.simplified_summary(document, level),
+                   lambda level=level: self.simplified_summary(document, level))
+                  for level in levels]
+
+        records = [{
+            'view': 'base',
+            'name': 'detailed base summary',
+            'truncated': truncated,
+            'derived_input_tokens': document_tokens,
+            'derived_seconds': base_seconds
+        }]
+        share = max(len(views), 1)
+        for kind, name, full_call, derived_call in views:
+            start = time.perf_counter()
+            full = full_call()
+            full_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            derived = derived_call()
+            derived_seconds = time.perf_counter() - start
+
+            records.append({
+                'view': kind,
+                'name': name,
+                'similarity': text_similarity(full, derived),
+                'full_input_tokens': document_tokens,
+                'derived_input_tokens': base_tokens,
+                'full_seconds': full_seconds,
+                'derived_seconds': derived_seconds,
+                'amortized_input_tokens': base_tokens + document_tokens / share,
+                'amortized_seconds': derived_seconds + base_seconds / share
+            })
+        return records
@@ -0,0 +1,179 @@
+"""
+Cluster-then-summarize digest over large document collections
+Model calls scale with the number of clusters, not documents
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from extractive import ExtractiveCompressor
+from summarizer import DocumentSummarizer
+from text_utils import tfidf_vectors
+
+
+def spherical_kmeans(matrix: np.ndarray, k: int, iterations: int = 50,
+                     seed: int = 0) -> np.ndarray:
+    """
+    Cluster L2-normalized rows by cosine similarity (k-means++ seeding)
+
+    Args:
+        matrix: Row-normalized document vectors
+        k: Number of clusters
+        iterations: Maximum refinement iterations
+        seed: Random seed for reproducible clustering
+
+    Returns:
+        Cluster label for each row
+    """
+    n = matrix.shape[0]
+    k = min(k, n)
+    rng = np.random.default_rng(seed)
+
+    centers = [rng.integers(n)]
+    distance = 1.0 - matrix @ matrix[centers[0]]
+    for _ in range(1, k):
+        weights = np.clip(distance, 0.0, None) ** 2
+        total = weights.sum()
+        chosen = rng.choice(n, p=weights / total) if total > 0 else rng.integers(n)
+        centers.append(chosen)
+        distance = np.minimum(distance, 1.0 - matrix @ matrix[chosen])
+    centroids = matrix[centers].copy()
+
+    labels = np.full(n, -1)
+    for _ in range(iterations):
+        similarity = matrix @ centroids.T
+        updated = similarity.argmax(axis=1)
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+        # Worst-fitting documents first; each re-seeds at most one empty cluster
+        worst = iter(np.argsort(similarity.max(axis=1), kind='stable'))
+        for c in range(k):
+            members = matrix[labels == c]
+            if len(members) == 0:
+                centroids[c] = matrix[next(worst)]
+                continue
+            center = members.sum(axis=0)
+            norm = np.linalg.norm(center)
+            centroids[c] = center / norm if norm else center
+    return labels
+
+
+class CorpusDigest:
+    """
+    Builds a single digest over many documents by clustering them locally,
+    summarizing representative members of each cluster in parallel and
+    combining the cluster summaries
+    """
+
+    def __init__(self, summarizer: DocumentSummarizer,
+                 n_clusters: Optional[int] = None, representatives: int = 3,
+                 member_token_budget: int = 600, max_workers: int = 4,
+                 seed: int = 0, min_df: int = 2, max_df: float = 0.95,
+                 max_features: int = 50000, dimensions: int = 256):
+        """
+        Initialize the digest builder
+
+        Args:
+            summarizer: Summarizer used for model calls
+            n_clusters: Number of clusters (defaults to sqrt(n / 2), max 20)
+            representatives: Documents closest to each centroid to summarize
+            member_token_budget: Extractive token budget per representative
+            max_workers: Parallel cluster summary calls
+            seed: Random seed for reproducible clustering
+            min_df: Ignore terms found in fewer documents than this
+            max_df: Ignore terms found in more than this fraction of documents
+            max_features: Vocabulary size cap, by document frequency
+            dimensions: Size of the projected vectors used for clustering
+        """
+        self.summarizer = summarizer
+        self.n_clusters = n_clusters
+        self.representatives = representatives
+        self.compressor = ExtractiveCompressor(token_budget=member_token_budget)
+        self.max_workers = max_workers
+        self.seed = seed
+        self.min_df = min_df
+        self.max_df = max_df
+        self.max_features = max_features
+        self.dimensions = dimensions
+
+    def vectorize(self, documents: List[str]) -> np.ndarray:
+        """
+        Sparse TF-IDF vectors projected to a fixed, small dimensionality
+
+        Args:
+            documents: Text content of each document
+
+        Returns:
+            Row-normalized array of shape (len(documents), dimensions)
+        """
+        vectors = tfidf_vectors(documents, min_df=self.min_df, max_df=self.max_df,
+                                max_features=self.max_features)
+        return vectors.project(self.dimensions, seed=self.seed)
+
+    def cluster(self, documents: List[str]) -> List[List[int]]:
+        """
+        Group documents into clusters, each ordered by centrality
+
+        Args:
+            documents: Text content of each document
+
+        Returns:
+            Document indices per cluster, largest cluster first
+        """
+        if not documents:
+            return []
+        k = self.n_clusters or min(20, max(1, math.ceil(math.sqrt(len(documents) / 2))))
+        matrix = self.vectorize(documents)
+        labels = spherical_kmeans(matrix, k, seed=self.seed)
+
+        clusters = []
+        for c in np.unique(labels):
+            members = np.flatnonzero(labels == c)
+            centroid = matrix[members].mean(axis=0)
+            ranked = members[np.argsort(-(matrix[members] @ centroid), kind='stable')]
+            clusters.append([int(i) for i in ranked])
+        clusters.sort(key=len, reverse=True)
+        return clusters
+
+    def _summarize_cluster(self, documents: List[str], members: List[int]) -> str:
+        """Summarize the most central members of one cluster"""
+        texts = [self.compressor.compress(documents[i])
+                 for i in members[:self.representatives]]
+        prompt = self.summarizer.templates.cluster_summary(texts)
+        return self.summarizer._invoke_model(prompt, max_tokens=512)
+
+    def digest(self, documents: List[str]) -> dict:
+        """
+        Build a digest of the corpus
+
+        Args:
+            documents: Text content of each document
+
+        Returns:
+            Dict with the combined "digest" text and per-cluster details
+        """
+        clusters = self.cluster(documents)
+        if not clusters:
+            return {'digest': '', 'clusters': []}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            summaries = list(pool.map(
+                lambda members: self._summarize_cluster(documents, members),
+                clusters
+            ))
+
+        prompt = self.summarizer.templates.corpus_digest(
+            summaries, [len(members) for members in clusters]
+        )
+        return {
+            'digest': self.summarizer._invoke_model(prompt),
+            'clusters': [
+                {'members': members, 'size': len(members), 'summary': summary}
+                for members, summary in zip(clusters, summaries)
+            ]
+        }
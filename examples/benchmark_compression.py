@@ -0,0 +1,74 @@
+"""
+Example: Benchmark extractive pre-compression against full-document prompting
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from summarizer import DocumentSummarizer
+from extractive import ExtractiveCompressor
+from text_utils import estimate_tokens, text_similarity
+
+
+SUMMARY_METHODS = ['one_sentence_summary', 'short_summary', 'basic_summary']
+
+
+def timed(func, *args):
+    """Run a function and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark(paths, method='tfidf', offline=False):
+    """
+    Compare compressed and full-document summaries
+
+    Args:
+        paths: Document files to benchmark
+        method: Sentence scoring method for the compressor
+        offline: Only measure compression (no Bedrock calls)
+    """
+    compressor = ExtractiveCompressor(method=method)
+    full = None if offline else DocumentSummarizer()
+    compressed = None if offline else DocumentSummarizer(compressor=compressor)
+
+    header = f"{'document':<20} {'method':<22} {'tokens':>13} {'compress':>9}"
+    if not offline:
+        header += f" {'full s':>7} {'comp s':>7} {'agree':>6} {'cover':>6}"
+    print(header)
+    print("-" * len(header))
+
+    for path in paths:
+        document = Path(path).read_text(encoding='utf-8')
+
+        for summary_type in SUMMARY_METHODS:
+            reduced, compress_time = timed(compressor.compress, document,
+                                           summary_type)
+            tokens = f"{estimate_tokens(document)}->{estimate_tokens(reduced)}"
+            row = (f"{Path(path).name[:20]:<20} {summary_type:<22} "
+                   f"{tokens:>13} {compress_time * 1000:>7.1f}ms")
+
+            if not offline:
+                full_summary, full_time = timed(getattr(full, summary_type),
+                                                document)
+                comp_summary, comp_time = timed(getattr(compressed, summary_type),
+                                                document)
+                # Agreement with the full-document summary and coverage of
+                # the original document act as cheap quality proxies
+                agree = text_similarity(full_summary, comp_summary)
+                cover = text_similarity(comp_summary, document)
+                row += (f" {full_time:>7.2f} {comp_time:>7.2f}"
+                        f" {agree:>6.2f} {cover:>6.2f}")
+
+            print(row)
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    benchmark(
+        paths=args or [str(Path(__file__).parent / 'sample.txt')],
+        method='textrank' if '--textrank' in sys.argv else 'tfidf',
+        offline='--offline' in sys.argv
+    )
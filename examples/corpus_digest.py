@@ -0,0 +1,38 @@
+"""
+Example: Digest of a large document collection
+
+Where comparison_summary in custom_prompts.py sends two documents in one
+prompt, CorpusDigest clusters thousands of documents locally and only sends
+one call per cluster plus one call to combine them.
+"""
+
+from pathlib import Path
+
+from summarizer import DocumentSummarizer
+from digest import CorpusDigest
+
+
+def weekly_digest(input_dir, n_clusters=None):
+    """
+    Build a digest over every .txt file in a directory tree
+
+    Args:
+        input_dir: Directory containing the week's articles
+        n_clusters: Number of topics (optional)
+    """
+    paths = sorted(Path(input_dir).rglob('*.txt'))
+    documents = [p.read_text(encoding='utf-8') for p in paths]
+
+    builder = CorpusDigest(DocumentSummarizer(), n_clusters=n_clusters)
+    result = builder.digest(documents)
+
+    for i, cluster in enumerate(result['clusters'], 1):
+        names = ", ".join(paths[m].name for m in cluster['members'][:3])
+        print(f"Topic {i}: {cluster['size']} documents (e.g. {names})")
+
+    print("\nDIGEST:")
+    print(result['digest'])
+
+
+if __name__ == "__main__":
+    weekly_digest('./news')
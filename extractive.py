@@ -0,0 +1,136 @@
+"""
+Extractive pre-compression of documents before prompting
+Keeps the most central sentences so the model sees fewer input tokens
+"""
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from text_utils import estimate_tokens, split_sentences, tfidf_vectors
+
+
+# Fraction of sentences kept per summary method (None disables compression)
+DEFAULT_RATIOS = {
+    'basic_summary': 0.6,
+    'one_sentence_summary': 0.3,
+    'short_summary': 0.4,
+    'structured_summary': 0.7,
+    'personalized_summary': 0.6,
+    'simplified_summary': 0.5,
+    'topic_focused_summary': None,
+}
+
+
+class ExtractiveCompressor:
+    """
+    Scores sentences with TF-IDF centrality or TextRank and keeps the top
+    fraction (or a token budget) in their original order
+    """
+
+    METHODS = ('tfidf', 'textrank')
+
+    def __init__(self, ratios: Optional[Dict[str, Optional[float]]] = None,
+                 method: str = 'tfidf', token_budget: Optional[int] = None,
+                 min_sentences: int = 5):
+        """
+        Initialize the compressor
+
+        Args:
+            ratios: Fraction of sentences to keep, keyed by summary method name
+            method: Sentence scoring method ("tfidf" or "textrank")
+            token_budget: Maximum estimated tokens to keep (overrides ratios,
+                except that types with a None ratio are never compressed)
+            min_sentences: Documents with fewer sentences are left untouched
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown scoring method: {method}")
+        self.ratios = dict(DEFAULT_RATIOS)
+        if ratios:
+            self.ratios.update(ratios)
+        self.method = method
+        self.token_budget = token_budget
+        self.min_sentences = min_sentences
+
+    def score_sentences(self, sentences: List[str]) -> np.ndarray:
+        """
+        Score sentences by importance
+
+        Args:
+            sentences: Sentences of a single document
+
+        Returns:
+            Array of scores aligned with the input sentences
+        """
+        vectors = tfidf_vectors(sentences)
+        if self.method == 'textrank':
+            # The sentence graph is per document, so a dense copy stays small
+            return self._textrank(vectors.toarray())
+
+        centroid = vectors.mean()
+        norm = np.linalg.norm(centroid)
+        if norm == 0:
+            return np.zeros(len(sentences))
+        return vectors.dot_vector(centroid / norm)
+
+    @staticmethod
+    def _textrank(matrix: np.ndarray, damping: float = 0.85,
+                  iterations: int = 50, tol: float = 1e-6) -> np.ndarray:
+        """PageRank over the sentence cosine-similarity graph"""
+        n = matrix.shape[0]
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+        row_sums = similarity.sum(axis=1, keepdims=True)
+        transition = np.divide(similarity, row_sums,
+                               out=np.full_like(similarity, 1.0 / n),
+                               where=row_sums > 0)
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(iterations):
+            updated = (1 - damping) / n + damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < tol:
+                return updated
+            scores = updated
+        return scores
+
+    def compress(self, document: str, summary_type: Optional[str] = None) -> str:
+        """
+        Reduce the document to its most important sentences
+
+        Args:
+            document: Text content to compress
+            summary_type: Summary method name used to look up the keep ratio
+
+        Returns:
+            Compressed document (or the original if compression does not apply)
+        """
+        ratio = self.ratios.get(summary_type) if summary_type else None
+        # A None ratio disables compression for that type, even under a budget
+        if summary_type in self.ratios and ratio is None:
+            return document
+        if ratio is None and self.token_budget is None:
+            return document
+        if ratio is not None and ratio >= 1.0 and self.token_budget is None:
+            return document
+
+        sentences = split_sentences(document)
+        if len(sentences) < self.min_sentences:
+            return document
+
+        scores = self.score_sentences(sentences)
+        ranked = np.argsort(-scores, kind='stable')
+
+        if self.token_budget is not None:
+            keep, used = [], 0
+            for idx in ranked:
+                cost = estimate_tokens(sentences[idx])
+                if keep and used + cost > self.token_budget:
+                    continue
+                keep.append(idx)
+                used += cost
+        else:
+            count = max(1, math.ceil(ratio * len(sentences)))
+            keep = ranked[:count]
+
+        return " ".join(sentences[i] for i in sorted(keep))
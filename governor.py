@@ -0,0 +1,203 @@
+"""
+Cross-process request/token budget governor for a shared Bedrock quota
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+DEFAULT_LEDGER_PATH = os.path.join(tempfile.gettempdir(),
+                                   'bedrock-summarization-ledger.json')
+PRIORITIES = ('normal', 'high')
+
+
+class LedgerStore(ABC):
+    """
+    Storage backend holding the shared usage ledger
+    """
+
+    @abstractmethod
+    def transaction(self):
+        """Yield the ledger state dict under exclusive access and persist it
+
+        Implementations return a context manager (e.g. via @contextmanager).
+        """
+
+
+class InMemoryLedgerStore(LedgerStore):
+    """
+    Ledger shared by all summarizers in a single process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            yield self._state
+
+
+class FileLedgerStore(LedgerStore):
+    """
+    Ledger shared by all processes on a host through a file lock
+    """
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH):
+        """
+        Initialize the file-backed ledger
+
+        Args:
+            path: Ledger file shared by every participating process
+        """
+        if fcntl is None:
+            raise RuntimeError("File-locked ledger requires a POSIX platform")
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock, open(self.path, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                try:
+                    state = json.loads(content) if content else {}
+                except ValueError:
+                    state = {}
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class BudgetGovernor:
+    """
+    Sliding-window limiter for requests and tokens per minute
+
+    Normal-priority callers may only use (1 - reserve_fraction) of each limit;
+    the remaining headroom is reserved for high-priority callers.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int,
+                 store: Optional[LedgerStore] = None,
+                 reserve_fraction: float = 0.2, window: float = 60.0,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the governor
+
+        Args:
+            requests_per_minute: Request quota shared by all callers
+            tokens_per_minute: Token quota shared by all callers
+            store: Ledger backend (defaults to a file-locked ledger)
+            reserve_fraction: Share of each limit reserved for high priority
+            window: Length of the sliding window in seconds
+            clock: Wall-clock time source (shared across processes)
+            sleep: Sleep function used while waiting for budget
+        """
+        if not 0 <= reserve_fraction < 1:
+            raise ValueError("reserve_fraction must be in [0, 1)")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.store = store or FileLedgerStore()
+        self.reserve_fraction = reserve_fraction
+        self.window = window
+        self.clock = clock
+        self.sleep = sleep
+
+    def _prune(self, entries: dict, now: float):
+        """Drop ledger entries that have left the window"""
+        for key in [k for k, (ts, _) in entries.items() if ts <= now - self.window]:
+            del entries[key]
+
+    def usage(self) -> dict:
+        """
+        Current usage inside the window
+
+        Returns:
+            Dict with "requests" and "tokens" counts
+        """
+        with self.store.transaction() as state:
+            entries = state.setdefault('entries', {})
+            self._prune(entries, self.clock())
+            return {
+                'requests': len(entries),
+                'tokens': sum(tokens for _, tokens in entries.values())
+            }
+
+    def acquire(self, tokens: int, priority: str = 'normal',
+                timeout: Optional[float] = None) -> str:
+        """
+        Block until the call fits in the budget, then record it
+
+        Args:
+            tokens: Estimated tokens for the call (input plus max output)
+            priority: "normal" or "high" (high may use reserved headroom)
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Reservation id to pass to settle()
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        share = 1.0 if priority == 'high' else 1.0 - self.reserve_fraction
+        request_limit = self.requests_per_minute * share
+        token_limit = self.tokens_per_minute * share
+        deadline = None if timeout is None else self.clock() + timeout
+
+        while True:
+            now = self.clock()
+            with self.store.transaction() as state:
+                entries = state.setdefault('entries', {})
+                self._prune(entries, now)
+                used_tokens = sum(t for _, t in entries.values())
+
+                # An oversized call is admitted once the window is empty
+                fits = (len(entries) + 1 <= request_limit
+                        and used_tokens + tokens <= token_limit)
+                if fits or not entries:
+                    reservation = uuid.uuid4().hex
+                    entries[reservation] = [now, tokens]
+                    return reservation
+
+                oldest = min(ts for ts, _ in entries.values())
+                wait = max(oldest + self.window - now, 0.05)
+
+            if deadline is not None:
+                if now >= deadline:
+                    raise TimeoutError("Timed out waiting for Bedrock budget")
+                wait = min(wait, deadline - now)
+            self.sleep(wait)
+
+    def settle(self, reservation: str, tokens: int):
+        """
+        Replace a reservation's estimate with the actual token usage
+
+        Args:
+            reservation: Id returned by acquire()
+            tokens: Tokens actually consumed by the call
+        """
+        with self.store.transaction() as state:
+            entries = state.setdefault('entries', {})
+            if reservation in entries:
+                entries[reservation][1] = tokens
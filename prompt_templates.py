@@ -62,6 +62,68 @@ Summarize the above article so that a {reading_level} can understand it:"""
 
 In a couple of sentences, briefly summarize any information about {topic} in the article:"""
     
+    @staticmethod
+    def detailed_base_summary(document: str) -> str:
+        """Detailed summary used as the source for derived views"""
+        return f"""{document}
+
+Write a detailed summary of the above article. Keep every key fact, figure, name, date, risk and recommendation, grouped by theme, so that the summary can stand in for the full article:"""
+    
+    @staticmethod
+    def personalized_from_summary(summary: str, role: str,
+                                  focus: Optional[str] = None) -> str:
+        """Role-based summary derived from a detailed summary"""
+        focus_text = f"Focus on {focus}." if focus else ""
+        return f"""Detailed summary of an article:
+{summary}
+
+Using only the information above, concisely summarize the article from a {role}'s perspective. {focus_text}"""
+    
+    @staticmethod
+    def simplified_from_summary(summary: str, reading_level: str) -> str:
+        """Reading-level summary derived from a detailed summary"""
+        return f"""Detailed summary of an article:
+{summary}
+
+Using only the information above, summarize the article so that a {reading_level} can understand it:"""
+    
+    @staticmethod
+    def revise_summary(summary: str, removed: List[str], added: List[str]) -> str:
+        """Revise an existing summary using only the changed sections"""
+        removed_str = "\n\n".join(removed) or "(none)"
+        added_str = "\n\n".join(added) or "(none)"
+        return f"""Existing summary of a document:
+{summary}
+
+Sections removed from or replaced in the document:
+{removed_str}
+
+Sections added to the document or replacing the ones above:
+{added_str}
+
+Revise the existing summary so it reflects the updated document. Keep the length, style and format of the existing summary, change only what the edits affect, and output only the revised summary:"""
+    
+    @staticmethod
+    def cluster_summary(documents: List[str]) -> str:
+        """Summary of a group of related documents"""
+        docs_str = "\n\n".join(
+            f"Document {i}:\n{doc}" for i, doc in enumerate(documents, 1)
+        )
+        return f"""{docs_str}
+
+The documents above cover a common story or theme. In a short paragraph, summarize what they report together, noting any points where they disagree:"""
+    
+    @staticmethod
+    def corpus_digest(cluster_summaries: List[str], sizes: List[int]) -> str:
+        """Digest combining per-cluster summaries"""
+        topics_str = "\n\n".join(
+            f"Topic {i} ({size} documents):\n{summary}"
+            for i, (summary, size) in enumerate(zip(cluster_summaries, sizes), 1)
+        )
+        return f"""{topics_str}
+
+Combine the topic summaries above into a single digest. Lead with the topics covered by the most documents and give each topic a brief headline and summary:"""
+    
     @staticmethod
     def custom_prompt(document: str, instruction: str) -> str:
         """Custom summarization with user-defined instruction"""
@@ -98,3 +160,9 @@ class RoleTemplates:
         "role": "HR director",
         "focus": "workforce impacts, talent requirements, and organizational changes"
     }
+    
+    @classmethod
+    def all(cls) -> List[dict]:
+        """All predefined role templates"""
+        return [cls.FINANCIAL_ANALYST, cls.CTO, cls.MARKETING_MANAGER,
+                cls.OPERATIONS_MANAGER, cls.HR_DIRECTOR]
@@ -29,6 +29,7 @@ setup(
         "boto3>=1.34.0",
         "python-dotenv>=1.0.0",
         "click>=8.1.0",
+        "numpy>=1.22",
     ],
     entry_points={
         "console_scripts": [
@@ -0,0 +1,200 @@
+"""
+Deterministic sharding of batch inputs across nodes
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+
+REPORT_NAME = 'batch_report.json'
+_SHARD_REPORT = re.compile(r'batch_report\.shard-(\d+)-of-(\d+)\.json')
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification such as "0/4"
+
+    Args:
+        spec: Shard index and count separated by "/"
+
+    Returns:
+        Tuple of (index, count)
+    """
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}', index must be in 0..N-1")
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    """
+    Stable shard assignment for a key (independent of Python hash seeds)
+
+    Args:
+        key: Identifier of the input, e.g. its relative path
+        count: Total number of shards
+
+    Returns:
+        Shard index in 0..count-1
+    """
+    digest = hashlib.sha1(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+
+def iter_documents(root, pattern: str = '*.txt',
+                   recursive: bool = False) -> Iterator[Path]:
+    """
+    Lazily discover input files in deterministic order
+
+    Args:
+        root: Directory to search
+        pattern: Filename glob to match
+        recursive: Descend into subdirectories
+
+    Yields:
+        Matching file paths
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if fnmatch.fnmatch(name, pattern):
+                yield Path(dirpath) / name
+        if not recursive:
+            break
+
+
+def iter_shard(root, index: int, count: int, pattern: str = '*.txt',
+               recursive: bool = False) -> Iterator[Path]:
+    """
+    Yield only the input files belonging to one shard
+
+    Args:
+        root: Directory to search
+        index: Shard index of this node
+        count: Total number of shards
+        pattern: Filename glob to match
+        recursive: Descend into subdirectories
+
+    Yields:
+        File paths assigned to the shard
+    """
+    root = Path(root)
+    for path in iter_documents(root, pattern, recursive):
+        if shard_of(path.relative_to(root).as_posix(), count) == index:
+            yield path
+
+
+def report_name(index: int = None, count: int = None) -> str:
+    """Report filename for a shard (or the unsharded report)"""
+    if count is None or count == 1:
+        return REPORT_NAME
+    return f"batch_report.shard-{index}-of-{count}.json"
+
+
+def find_shard_reports(shard_dirs: List) -> List[Tuple[int, int, Path]]:
+    """
+    Locate batch reports and the shard each one belongs to
+
+    A plain batch_report.json counts as shard 0/1 (an unsharded run) unless
+    the same directory also holds shard reports, in which case it is the
+    result of an earlier merge and is ignored.
+
+    Args:
+        shard_dirs: Output directories written by individual shards
+
+    Returns:
+        List of (index, count, report path)
+    """
+    reports = []
+    for shard_dir in shard_dirs:
+        shard_path = Path(shard_dir)
+        found = []
+        for report_file in sorted(shard_path.glob('batch_report.shard-*.json')):
+            match = _SHARD_REPORT.fullmatch(report_file.name)
+            if match:
+                found.append((int(match.group(1)), int(match.group(2)), report_file))
+        if not found and (shard_path / REPORT_NAME).exists():
+            found.append((0, 1, shard_path / REPORT_NAME))
+        reports.extend(found)
+    return reports
+
+
+def shard_problems(reports: List[Tuple[int, int, Path]]) -> List[str]:
+    """
+    Check that reports form exactly one complete set of shards
+
+    Args:
+        reports: Output of find_shard_reports()
+
+    Returns:
+        Descriptions of missing, duplicated or inconsistent shards
+    """
+    if not reports:
+        return ["no batch reports found"]
+
+    counts = sorted({count for _, count, _ in reports})
+    if len(counts) > 1:
+        return [f"reports come from runs with different shard counts: {counts}"]
+
+    count = counts[0]
+    seen = {}
+    for index, _, path in reports:
+        seen.setdefault(index, []).append(str(path))
+
+    problems = [f"shard {index}/{count} reported more than once: {', '.join(paths)}"
+                for index, paths in sorted(seen.items()) if len(paths) > 1]
+    missing = [str(i) for i in range(count) if i not in seen]
+    if missing:
+        problems.append(f"missing shards {', '.join(missing)} of {count}")
+    return problems
+
+
+def merge_shards(shard_dirs: List, output_dir,
+                 allow_incomplete: bool = False) -> List[dict]:
+    """
+    Combine per-shard outputs and reports into one directory
+
+    Args:
+        shard_dirs: Output directories written by individual shards
+        output_dir: Directory receiving merged outputs and report
+        allow_incomplete: Merge even if shards are missing or duplicated
+
+    Returns:
+        Combined report entries, sorted by input file
+    """
+    reports = find_shard_reports(shard_dirs)
+    problems = shard_problems(reports)
+    if problems and not allow_incomplete:
+        raise ValueError("Incomplete shard set: " + "; ".join(problems))
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    results = []
+
+    for _, _, report_file in reports:
+        shard_path = report_file.parent
+        with open(report_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+
+        for entry in entries:
+            if entry.get('output'):
+                source = shard_path / entry['output']
+                target = output_path / entry['output']
+                if source.resolve() != target.resolve():
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(source, target)
+            results.append(entry)
+
+    results.sort(key=lambda entry: entry['file'])
+    with open(output_path / REPORT_NAME, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return results
@@ -5,8 +5,16 @@ Provides intelligent document summarization using Claude 3 via Amazon Bedrock
 
 import boto3
 import json
-from typing import Optional, List
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from contextlib import nullcontext
+from typing import Optional, List, Tuple
 from prompt_templates import PromptTemplates
+from extractive import ExtractiveCompressor
+from governor import BudgetGovernor
+from text_utils import estimate_tokens
+from tracing import Tracer
+from adaptive import DEFAULT_STOP_SEQUENCES, OutputTokenStats
 
 
 class DocumentSummarizer:
@@ -14,17 +22,194 @@ class DocumentSummarizer:
     Main class for document summarization using Amazon Bedrock
     """
     
-    def __init__(self, region: str = 'us-east-1', model_id: str = None):
+    # Output caps per summary method (others use 1024)
+    MAX_TOKENS = {
+        'one_sentence_summary': 256,
+        'short_summary': 512,
+        'detailed_base_summary': 2048,
+    }
+    
+    # Bedrock errors retried through the governor
+    RETRYABLE_ERRORS = ('ThrottlingException', 'ServiceUnavailableException')
+    
+    def __init__(self, region: str = 'us-east-1', model_id: str = None,
+                 compressor: Optional[ExtractiveCompressor] = None,
+                 governor: Optional[BudgetGovernor] = None,
+                 priority: str = 'normal',
+                 tracer: Optional[Tracer] = None,
+                 output_stats: Optional[OutputTokenStats] = None,
+                 stop_sequences: Optional[dict] = None,
+                 max_continuations: int = 2,
+                 max_retries: int = 3):
         """
         Initialize the summarizer with AWS Bedrock client
         
         Args:
             region: AWS region for Bedrock service
             model_id: Specific model ID to use (defaults to Claude 3 Sonnet)
+            compressor: Optional extractive pre-compression stage applied
+                before prompts are rendered
+            governor: Optional shared budget governor consulted before each call
+            priority: Governor priority for this instance ("normal" or "high")
+            tracer: Optional tracer recording a span for each call stage
+            output_stats: Optional output-length history; enables adaptive
+                max_tokens, stop sequences and continuation at the learned
+                cap (up to the static cap in total)
+            stop_sequences: Stop sequences per summary method (defaults to
+                DEFAULT_STOP_SEQUENCES when output_stats is set)
+            max_continuations: Follow-up calls allowed when a response hits
+                an adaptive cap
+            max_retries: Throttled attempts retried through the governor;
+                botocore's own retries are disabled when a governor is set
+                so every attempt is recorded in the shared ledger
         """
-        self.bedrock = boto3.client('bedrock-runtime', region_name=region)
+        if governor is not None:
+            self.bedrock = boto3.client(
+                'bedrock-runtime', region_name=region,
+                config=Config(retries={'max_attempts': 1, 'mode': 'standard'})
+            )
+        else:
+            self.bedrock = boto3.client('bedrock-runtime', region_name=region)
         self.model_id = model_id or 'anthropic.claude-3-sonnet-20240229-v1:0'
         self.templates = PromptTemplates()
+        self.compressor = compressor
+        self.governor = governor
+        self.priority = priority
+        self.tracer = tracer
+        self.output_stats = output_stats
+        self.stop_sequences = (DEFAULT_STOP_SEQUENCES if stop_sequences is None
+                               else stop_sequences)
+        self.max_continuations = max_continuations
+        self.max_retries = max_retries
+    
+    def _span(self, name: str):
+        """Trace span for a stage of work (no-op without a tracer)"""
+        return self.tracer.span(name) if self.tracer else nullcontext()
+    
+    def _call_model(self, messages: List[dict], max_tokens: int,
+                    temperature: float,
+                    stop_sequences: Optional[List[str]] = None) -> dict:
+        """
+        Send a single request to the Bedrock model
+        
+        Args:
+            messages: Messages API conversation
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-1)
+            stop_sequences: Sequences that end generation (optional)
+            
+        Returns:
+            Parsed response body
+        """
+        with self._span('serialize'):
+            request = {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "messages": messages
+            }
+            if stop_sequences:
+                request["stop_sequences"] = stop_sequences
+            body = json.dumps(request)
+        
+        attempt = 0
+        while True:
+            # Wait for shared quota; reserve input plus the full output cap
+            reservation = None
+            if self.governor is not None:
+                with self._span('budget_wait'):
+                    input_tokens = sum(estimate_tokens(m['content']) for m in messages)
+                    reservation = self.governor.acquire(
+                        input_tokens + max_tokens, priority=self.priority
+                    )
+            
+            try:
+                with self._span('network'):
+                    response = self.bedrock.invoke_model(
+                        modelId=self.model_id,
+                        body=body
+                    )
+                    raw_body = response['body'].read()
+                
+                with self._span('parse'):
+                    response_body = json.loads(raw_body)
+                
+                usage = response_body.get('usage')
+                if reservation is not None and usage:
+                    self.governor.settle(
+                        reservation,
+                        usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+                    )
+                
+                return response_body
+                
+            except Exception as e:
+                # Keep the request in the window but release its reserved tokens
+                if reservation is not None:
+                    self.governor.settle(reservation, 0)
+                    if attempt < self.max_retries and self._is_retryable(e):
+                        # Back off, then retry through acquire() like any call
+                        attempt += 1
+                        self.governor.sleep(min(2 ** attempt, 30))
+                        continue
+                raise Exception(f"Error invoking Bedrock model: {str(e)}")
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """Whether a failed call was throttled or the service was unavailable"""
+        return (isinstance(error, ClientError)
+                and error.response.get('Error', {}).get('Code') in self.RETRYABLE_ERRORS)
+    
+    def _generate(self, prompt: str, max_tokens: int = 1024,
+                  temperature: float = 0.7,
+                  stop_sequences: Optional[List[str]] = None,
+                  max_continuations: int = 0,
+                  total_tokens: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Generate a response, continuing it if it stops at the token cap
+        
+        Args:
+            prompt: The prompt to send to the model
+            max_tokens: Maximum tokens in the first response
+            temperature: Sampling temperature (0-1)
+            stop_sequences: Sequences that end generation (optional)
+            max_continuations: Follow-up calls allowed after hitting the cap
+            total_tokens: Output ceiling across the response and all
+                follow-ups (None disables continuation)
+            
+        Returns:
+            Tuple of (response text, total output tokens)
+        """
+        messages = [{"role": "user", "content": prompt}]
+        text, output_tokens = "", 0
+        call_tokens = max_tokens
+        
+        for _ in range(max_continuations + 1):
+            response_body = self._call_model(
+                messages, call_tokens, temperature, stop_sequences
+            )
+            
+            content = response_body.get('content') or [{'text': ''}]
+            chunk = content[0]['text']
+            text += chunk
+            usage = response_body.get('usage') or {}
+            output_tokens += usage.get('output_tokens', estimate_tokens(chunk))
+            
+            if response_body.get('stop_reason') != 'max_tokens' or total_tokens is None:
+                break
+            
+            # Continue only within what is left of the overall ceiling, and
+            # only with a non-empty prefill (assistant prefill may not be
+            # empty or end with whitespace)
+            call_tokens = total_tokens - output_tokens
+            prefill = text.rstrip()
+            if call_tokens <= 0 or not prefill:
+                break
+            
+            # Prefill the partial answer so the model picks up where it stopped
+            text = prefill
+            messages = [messages[0], {"role": "assistant", "content": text}]
+        
+        return text, output_tokens
     
     def _invoke_model(self, prompt: str, max_tokens: int = 1024, 
                      temperature: float = 0.7) -> str:
@@ -39,29 +224,48 @@ class DocumentSummarizer:
         Returns:
             Model response as string
         """
-        body = json.dumps({
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        })
-        
-        try:
-            response = self.bedrock.invoke_model(
-                modelId=self.model_id,
-                body=body
-            )
-            
-            response_body = json.loads(response['body'].read())
-            return response_body['content'][0]['text']
+        return self._generate(prompt, max_tokens, temperature)[0]
+    
+    def _summarize(self, summary_type: str, render, document: str, *args,
+                   max_tokens: Optional[int] = None) -> str:
+        """
+        Compress (if enabled), render and send a summarization prompt
+        
+        With output statistics enabled, the cap comes from observed output
+        lengths for this summary type and model, per-type stop sequences are
+        applied, and responses that hit the cap are continued.
+        
+        Args:
+            summary_type: Name of the public summary method
+            render: Prompt template function taking the document first
+            document: Text content to summarize
+            *args: Extra template arguments
+            max_tokens: Maximum tokens in response (defaults to MAX_TOKENS)
             
-        except Exception as e:
-            raise Exception(f"Error invoking Bedrock model: {str(e)}")
+        Returns:
+            Model response as string
+        """
+        if self.compressor is not None:
+            with self._span('compress'):
+                document = self.compressor.compress(document, summary_type)
+        with self._span('render'):
+            prompt = render(document, *args)
+        if max_tokens is None:
+            max_tokens = self.MAX_TOKENS.get(summary_type, 1024)
+        if self.output_stats is None:
+            return self._invoke_model(prompt, max_tokens=max_tokens)
+        
+        # Continue only when the learned cap, not the static one, cut the
+        # response off, and never beyond the static cap in total
+        cap = self.output_stats.max_tokens(summary_type, self.model_id, max_tokens)
+        text, output_tokens = self._generate(
+            prompt, cap,
+            stop_sequences=self.stop_sequences.get(summary_type),
+            max_continuations=self.max_continuations,
+            total_tokens=max_tokens if cap < max_tokens else None
+        )
+        self.output_stats.record(summary_type, self.model_id, output_tokens)
+        return text
     
     def basic_summary(self, document: str) -> str:
         """
@@ -73,8 +277,8 @@ class DocumentSummarizer:
         Returns:
             Summary text
         """
-        prompt = self.templates.basic_summary(document)
-        return self._invoke_model(prompt)
+        return self._summarize('basic_summary', self.templates.basic_summary,
+                               document)
     
     def one_sentence_summary(self, document: str) -> str:
         """
@@ -86,8 +290,8 @@ class DocumentSummarizer:
         Returns:
             One-sentence summary
         """
-        prompt = self.templates.one_sentence(document)
-        return self._invoke_model(prompt, max_tokens=256)
+        return self._summarize('one_sentence_summary', self.templates.one_sentence,
+                               document)
     
     def short_summary(self, document: str) -> str:
         """
@@ -99,8 +303,8 @@ class DocumentSummarizer:
         Returns:
             Short summary
         """
-        prompt = self.templates.short_summary(document)
-        return self._invoke_model(prompt, max_tokens=512)
+        return self._summarize('short_summary', self.templates.short_summary,
+                               document)
     
     def structured_summary(self, document: str, 
                           sections: List[str]) -> str:
@@ -114,8 +318,9 @@ class DocumentSummarizer:
         Returns:
             Structured summary with sections
         """
-        prompt = self.templates.structured_summary(document, sections)
-        return self._invoke_model(prompt)
+        return self._summarize('structured_summary',
+                               self.templates.structured_summary,
+                               document, sections)
     
     def personalized_summary(self, document: str, role: str, 
                            focus: Optional[str] = None) -> str:
@@ -130,8 +335,9 @@ class DocumentSummarizer:
         Returns:
             Role-specific summary
         """
-        prompt = self.templates.personalized_summary(document, role, focus)
-        return self._invoke_model(prompt)
+        return self._summarize('personalized_summary',
+                               self.templates.personalized_summary,
+                               document, role, focus)
     
     def simplified_summary(self, document: str, 
                           reading_level: str = "third-grader") -> str:
@@ -145,8 +351,9 @@ class DocumentSummarizer:
         Returns:
             Simplified summary
         """
-        prompt = self.templates.simplified_summary(document, reading_level)
-        return self._invoke_model(prompt)
+        return self._summarize('simplified_summary',
+                               self.templates.simplified_summary,
+                               document, reading_level)
     
     def topic_focused_summary(self, document: str, topic: str) -> str:
         """
@@ -159,8 +366,9 @@ class DocumentSummarizer:
         Returns:
             Topic-focused summary
         """
-        prompt = self.templates.topic_focused(document, topic)
-        return self._invoke_model(prompt)
+        return self._summarize('topic_focused_summary',
+                               self.templates.topic_focused,
+                               document, topic)
 
 
 # Example usage
@@ -0,0 +1,156 @@
+"""
+Unit tests for adaptive output caps
+"""
+
+import unittest
+from unittest.mock import Mock, patch, MagicMock
+import json
+import os
+import tempfile
+from adaptive import OutputTokenStats
+from summarizer import DocumentSummarizer
+
+
+def bedrock_response(text, stop_reason='end_turn', output_tokens=10):
+    """Build a mocked Bedrock response"""
+    response = {'body': MagicMock()}
+    response['body'].read.return_value = json.dumps({
+        'content': [{'text': text}],
+        'stop_reason': stop_reason,
+        'usage': {'input_tokens': 50, 'output_tokens': output_tokens}
+    }).encode()
+    return response
+
+
+class TestOutputTokenStats(unittest.TestCase):
+
+    def test_cap_follows_percentile(self):
+        """Test the cap adapts once enough history exists"""
+        stats = OutputTokenStats(percentile=90, headroom=1.0, min_samples=10, floor=16)
+        self.assertEqual(stats.max_tokens('short_summary', 'm', 512), 512)
+
+        for tokens in range(10, 110, 10):
+            stats.record('short_summary', 'm', tokens)
+
+        self.assertEqual(stats.max_tokens('short_summary', 'm', 512), 91)
+        self.assertEqual(stats.max_tokens('short_summary', 'other', 512), 512)
+        self.assertEqual(stats.max_tokens('short_summary', 'm', 50), 50)
+
+    def test_history_round_trip(self):
+        """Test history is saved and reloaded"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stats.json')
+            stats = OutputTokenStats(min_samples=1, headroom=1.0, floor=1, path=path)
+            stats.record('basic_summary', 'm', 40)
+            stats.save()
+
+            reloaded = OutputTokenStats(min_samples=1, headroom=1.0, floor=1, path=path)
+            self.assertEqual(reloaded.max_tokens('basic_summary', 'm', 1024), 40)
+
+    def test_corrupt_history_is_ignored(self):
+        """Test a truncated history file is treated as no history"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stats.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('{"m/basic_summary": [40, 5')
+
+            stats = OutputTokenStats(min_samples=1, path=path)
+            self.assertEqual(stats.max_tokens('basic_summary', 'm', 1024), 1024)
+            stats.record('basic_summary', 'm', 40)
+            stats.save()
+
+            with open(path, 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f), {'m/basic_summary': [40]})
+
+    def test_concurrent_runs_merge_samples(self):
+        """Test runs sharing a history file keep each other's samples"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stats.json')
+            first = OutputTokenStats(path=path)
+            second = OutputTokenStats(path=path)
+            first.record('basic_summary', 'm', 40)
+            second.record('basic_summary', 'm', 60)
+            first.save()
+            second.save()
+            first.save()
+
+            with open(path, 'r', encoding='utf-8') as f:
+                self.assertEqual(sorted(json.load(f)['m/basic_summary']), [40, 60])
+            self.assertEqual(sorted(os.listdir(tmp)), ['stats.json', 'stats.json.lock'])
+
+
+class TestAdaptiveSummarizer(unittest.TestCase):
+
+    @patch('boto3.client')
+    def test_adaptive_cap_stop_sequences_and_continuation(self, mock_boto_client):
+        """Test capped responses are continued and lengths recorded"""
+        mock_client = Mock()
+        mock_client.invoke_model.side_effect = [
+            bedrock_response('AWS revenue grew ', 'max_tokens', 20),
+            bedrock_response(' 12% in Q3.', 'end_turn', 5)
+        ]
+        mock_boto_client.return_value = mock_client
+
+        stats = OutputTokenStats(min_samples=1, headroom=1.0, floor=1)
+        stats.record('short_summary', 'anthropic.claude-3-sonnet-20240229-v1:0', 20)
+        summarizer = DocumentSummarizer(output_stats=stats)
+
+        result = summarizer.short_summary("AWS revenue grew 12% year-over-year.")
+
+        self.assertEqual(result, 'AWS revenue grew 12% in Q3.')
+        first, second = [json.loads(call.kwargs['body'])
+                         for call in mock_client.invoke_model.call_args_list]
+        self.assertEqual(first['max_tokens'], 20)
+        self.assertIn("\n\nNote:", first['stop_sequences'])
+        self.assertEqual(second['max_tokens'], 492)
+        self.assertEqual(second['messages'][1],
+                         {'role': 'assistant', 'content': 'AWS revenue grew'})
+        self.assertEqual(stats.max_tokens('short_summary',
+                                          'anthropic.claude-3-sonnet-20240229-v1:0', 512), 25)
+
+    @patch('boto3.client')
+    def test_static_cap_is_not_continued(self, mock_boto_client):
+        """Test hitting the static cap with no history makes a single call"""
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = bedrock_response('Cut off', 'max_tokens', 256)
+        mock_boto_client.return_value = mock_client
+
+        summarizer = DocumentSummarizer(output_stats=OutputTokenStats())
+        result = summarizer.one_sentence_summary("AWS revenue grew.")
+
+        body = json.loads(mock_client.invoke_model.call_args.kwargs['body'])
+        self.assertEqual(result, 'Cut off')
+        self.assertEqual(mock_client.invoke_model.call_count, 1)
+        self.assertEqual(body['max_tokens'], 256)
+
+    @patch('boto3.client')
+    def test_whitespace_partial_is_not_prefilled(self, mock_boto_client):
+        """Test an empty partial response is not sent as assistant prefill"""
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = bedrock_response('\n\n', 'max_tokens', 2)
+        mock_boto_client.return_value = mock_client
+
+        stats = OutputTokenStats(min_samples=1, headroom=1.0, floor=1)
+        stats.record('short_summary', 'anthropic.claude-3-sonnet-20240229-v1:0', 2)
+        DocumentSummarizer(output_stats=stats).short_summary("AWS revenue grew.")
+
+        self.assertEqual(mock_client.invoke_model.call_count, 1)
+
+    @patch('boto3.client')
+    def test_static_caps_without_stats(self, mock_boto_client):
+        """Test default behaviour keeps static caps and a single call"""
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = bedrock_response('Cut off', 'max_tokens')
+        mock_boto_client.return_value = mock_client
+
+        summarizer = DocumentSummarizer()
+        summarizer.one_sentence_summary("AWS revenue grew.")
+
+        body = json.loads(mock_client.invoke_model.call_args.kwargs['body'])
+        self.assertEqual(mock_client.invoke_model.call_count, 1)
+        self.assertEqual(body['max_tokens'], 256)
+        self.assertNotIn('stop_sequences', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
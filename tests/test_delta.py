@@ -0,0 +1,87 @@
+"""
+Unit tests for DeltaSummarizer
+"""
+
+import unittest
+from unittest.mock import Mock
+import tempfile
+from pathlib import Path
+from delta import DeltaSummarizer, paragraph_diff
+from prompt_templates import PromptTemplates
+from summarizer import DocumentSummarizer
+
+
+class TestDeltaSummarizer(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a ten-paragraph living report"""
+        self.paragraphs = [f"Section {i}: metrics for region {i} were stable this week."
+                           for i in range(10)]
+        self.document = "\n\n".join(self.paragraphs)
+
+        self.summarizer = Mock()
+        self.summarizer.model_id = 'test-model'
+        self.summarizer.templates = PromptTemplates()
+        self.summarizer.MAX_TOKENS = DocumentSummarizer.MAX_TOKENS
+        self.summarizer.short_summary.return_value = 'Full summary.'
+        self.summarizer._invoke_model.return_value = 'Revised summary.'
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.updater = DeltaSummarizer(self.summarizer, self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_paragraph_diff(self):
+        """Test the diff reports changed paragraphs and their share"""
+        edited = self.paragraphs[:]
+        edited[3] = "Section 3: metrics for region 3 dropped sharply."
+        removed, added, ratio = paragraph_diff(self.document, "\n\n".join(edited))
+
+        self.assertEqual(removed, [self.paragraphs[3]])
+        self.assertEqual(added, [edited[3]])
+        self.assertLess(ratio, 0.15)
+
+    def test_small_edit_revises_from_changed_sections(self):
+        """Test a small edit sends only the changed paragraphs"""
+        first = self.updater.update('report.txt', self.document)
+        edited = self.document + "\n\nSection 10: a new region opened."
+        second = self.updater.update('report.txt', edited)
+
+        self.assertEqual(first['mode'], 'full')
+        self.assertEqual(second, {'summary': 'Revised summary.', 'mode': 'delta',
+                                  'change_ratio': second['change_ratio']})
+        prompt, = self.summarizer._invoke_model.call_args.args
+        self.assertIn("Full summary.", prompt)
+        self.assertIn("Section 10", prompt)
+        self.assertNotIn("Section 4", prompt)
+        self.assertEqual(self.summarizer._invoke_model.call_args.kwargs['max_tokens'], 512)
+
+    def test_unchanged_and_large_edits(self):
+        """Test unchanged documents reuse the summary and large edits resummarize"""
+        self.updater.update('report.txt', self.document)
+        unchanged = self.updater.update('report.txt', self.document)
+        rewritten = self.updater.update('report.txt', "Entirely new content.")
+
+        self.assertEqual(unchanged['mode'], 'unchanged')
+        self.assertEqual(rewritten['mode'], 'full')
+        self.assertEqual(self.summarizer.short_summary.call_count, 2)
+        self.summarizer._invoke_model.assert_not_called()
+
+    def test_corrupt_state_falls_back_to_full_summary(self):
+        """Test unreadable state is treated as missing and then repaired"""
+        self.updater.update('report.txt', self.document)
+        state_file, = Path(self.tmp.name).glob('*.json')
+        state_file.write_text('{"text": "trunc')
+
+        result = self.updater.update('report.txt', self.document)
+
+        self.assertEqual(result['mode'], 'full')
+        self.assertEqual(self.updater.update('report.txt', self.document)['mode'],
+                         'unchanged')
+        self.assertEqual([p.name for p in Path(self.tmp.name).iterdir()],
+                         [state_file.name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit tests for DerivedViewSummarizer
+"""
+
+import unittest
+from unittest.mock import Mock, patch, MagicMock
+import json
+import tempfile
+from pathlib import Path
+from derived_views import DerivedViewSummarizer
+from summarizer import DocumentSummarizer
+
+
+class TestDerivedViewSummarizer(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.sample_document = """
+        Amazon Web Services continues to grow with strong Q3 results.
+        AWS revenue increased by 12% year-over-year reaching $23.1 billion.
+        The company launched new AI services and expanded infrastructure.
+        """
+
+    def _mock_client(self, mock_boto_client, stop_reason='end_turn'):
+        """Bedrock client that echoes a fixed response"""
+        mock_client = Mock()
+
+        def invoke_model(modelId, body):
+            response = {'body': MagicMock()}
+            response['body'].read.return_value = json.dumps({
+                'content': [{'text': 'AWS grew 12% to $23.1 billion.'}],
+                'stop_reason': stop_reason
+            }).encode()
+            return response
+
+        mock_client.invoke_model.side_effect = invoke_model
+        mock_boto_client.return_value = mock_client
+        return mock_client
+
+    def _prompts(self, mock_client):
+        return [json.loads(call.kwargs['body'])['messages'][0]['content']
+                for call in mock_client.invoke_model.call_args_list]
+
+    @patch('boto3.client')
+    def test_fan_out_sends_document_once(self, mock_boto_client):
+        """Test views are derived from the base instead of the document"""
+        mock_client = self._mock_client(mock_boto_client)
+        views = DerivedViewSummarizer(DocumentSummarizer())
+
+        result = views.fan_out(self.sample_document, reading_levels=['third-grader'])
+
+        self.assertEqual(len(result['roles']), 5)
+        self.assertEqual(list(result['reading_levels']), ['third-grader'])
+        prompts = self._prompts(mock_client)
+        self.assertEqual(len(prompts), 7)
+        self.assertEqual(sum('expanded infrastructure' in p for p in prompts), 1)
+
+    @patch('boto3.client')
+    def test_base_summary_cached_on_disk(self, mock_boto_client):
+        """Test the base summary is reused across instances"""
+        mock_client = self._mock_client(mock_boto_client)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            DerivedViewSummarizer(DocumentSummarizer(), cache_dir=tmp) \
+                .base_summary(self.sample_document)
+            DerivedViewSummarizer(DocumentSummarizer(), cache_dir=tmp) \
+                .simplified_summary(self.sample_document)
+
+        self.assertEqual(mock_client.invoke_model.call_count, 2)
+
+    @patch('boto3.client')
+    def test_corrupt_cache_is_regenerated(self, mock_boto_client):
+        """Test unreadable or malformed cache files are treated as misses"""
+        mock_client = self._mock_client(mock_boto_client)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            DerivedViewSummarizer(DocumentSummarizer(), cache_dir=tmp) \
+                .base_summary(self.sample_document)
+            cache_file, = Path(tmp).glob('*.json')
+
+            for content in ('{"summary": "trunc', '{"model_id": "m"}'):
+                cache_file.write_text(content)
+                summary = DerivedViewSummarizer(DocumentSummarizer(), cache_dir=tmp) \
+                    .base_summary(self.sample_document)
+                self.assertEqual(summary, 'AWS grew 12% to $23.1 billion.')
+
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], [cache_file.name])
+        self.assertEqual(mock_client.invoke_model.call_count, 3)
+
+    @patch('boto3.client')
+    def test_fidelity_compares_with_full_generation(self, mock_boto_client):
+        """Test fidelity reports similarity and input token savings"""
+        self._mock_client(mock_boto_client)
+        views = DerivedViewSummarizer(DocumentSummarizer())
+
+        records = views.fidelity(self.sample_document, roles=[],
+                                 reading_levels=['third-grader'])
+
+        base, view = records
+        self.assertEqual(base['view'], 'base')
+        self.assertEqual(base['derived_input_tokens'], view['full_input_tokens'])
+        self.assertAlmostEqual(view['similarity'], 1.0)
+        self.assertLess(view['derived_input_tokens'], view['full_input_tokens'])
+        self.assertEqual(view['amortized_input_tokens'],
+                         view['derived_input_tokens'] + base['derived_input_tokens'])
+
+    @patch('boto3.client')
+    def test_truncated_base_is_flagged(self, mock_boto_client):
+        """Test a base summary stopped at its own cap is reported"""
+        mock_client = self._mock_client(mock_boto_client, stop_reason='max_tokens')
+        views = DerivedViewSummarizer(DocumentSummarizer())
+
+        with self.assertWarns(UserWarning):
+            result = views.fan_out(self.sample_document, roles=[], reading_levels=[])
+
+        self.assertTrue(result['base_truncated'])
+        body = json.loads(mock_client.invoke_model.call_args.kwargs['body'])
+        self.assertEqual(body['max_tokens'], 2048)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for CorpusDigest
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import tracemalloc
+import numpy as np
+from digest import CorpusDigest, spherical_kmeans
+from prompt_templates import PromptTemplates
+
+
+class TestCorpusDigest(unittest.TestCase):
+
+    def setUp(self):
+        """Set up two clearly separated topics"""
+        cloud = [f"AWS cloud revenue grew as Bedrock AI services launched in region {i}."
+                 for i in range(6)]
+        sports = [f"The football team won the league final with a late goal in match {i}."
+                  for i in range(4)]
+        self.documents = cloud + sports
+
+        self.summarizer = Mock()
+        self.summarizer.templates = PromptTemplates()
+        self.summarizer._invoke_model.return_value = 'Summary.'
+
+    def test_cluster_separates_topics(self):
+        """Test documents are grouped by topic, largest cluster first"""
+        builder = CorpusDigest(self.summarizer, n_clusters=2)
+        clusters = builder.cluster(self.documents)
+
+        self.assertEqual([sorted(c) for c in clusters],
+                         [list(range(6)), list(range(6, 10))])
+
+    def test_calls_scale_with_clusters(self):
+        """Test one call per cluster plus one combining call"""
+        builder = CorpusDigest(self.summarizer, n_clusters=2, representatives=2)
+        result = builder.digest(self.documents)
+
+        self.assertEqual(self.summarizer._invoke_model.call_count, 3)
+        self.assertEqual(result['digest'], 'Summary.')
+        self.assertEqual([c['size'] for c in result['clusters']], [6, 4])
+
+        final_prompt = self.summarizer._invoke_model.call_args_list[-1].args[0]
+        self.assertIn("Topic 1 (6 documents)", final_prompt)
+
+    def test_large_corpus_memory_bounded(self):
+        """Test vectors stay sparse and projected for a large vocabulary"""
+        rng = np.random.default_rng(0)
+        vocab = np.array([f"term{i}" for i in range(40000)])
+        documents = [" ".join(vocab[rng.zipf(1.3, 200) % len(vocab)])
+                     for _ in range(1500)]
+        builder = CorpusDigest(self.summarizer, n_clusters=10)
+
+        tracemalloc.start()
+        try:
+            vectors = builder.vectorize(documents)
+            clusters = builder.cluster(documents)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # A dense documents x vocabulary matrix would need hundreds of MB
+        self.assertEqual(vectors.shape, (1500, 256))
+        self.assertLess(peak, 50 * 1024 * 1024)
+        self.assertEqual(sum(len(c) for c in clusters), 1500)
+
+    def test_empty_clusters_reseeded_with_distinct_documents(self):
+        """Test several empty clusters do not collapse onto one document"""
+        matrix = np.array([[1.0, 0.0, 0.0], [1.0, 0.0, 0.0],
+                           [0.6, 0.8, 0.0], [0.0, 0.6, 0.8]])
+        # Force duplicate seeds so clusters 1 and 2 start empty
+        rng = Mock()
+        rng.integers.return_value = 0
+        rng.choice.return_value = 1
+        with patch('digest.np.random.default_rng', return_value=rng):
+            labels = spherical_kmeans(matrix, 3, iterations=2)
+
+        self.assertEqual(len(set(labels)), 3)
+        self.assertEqual(labels[0], labels[1])
+
+    def test_empty_corpus(self):
+        """Test an empty corpus makes no model calls"""
+        result = CorpusDigest(self.summarizer).digest([])
+
+        self.assertEqual(result, {'digest': '', 'clusters': []})
+        self.summarizer._invoke_model.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
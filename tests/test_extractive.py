@@ -0,0 +1,89 @@
+"""
+Unit tests for ExtractiveCompressor
+"""
+
+import unittest
+from unittest.mock import Mock, patch, MagicMock
+import json
+from extractive import ExtractiveCompressor
+from summarizer import DocumentSummarizer
+
+
+class TestExtractiveCompressor(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.document = (
+            "AWS revenue grew 12% year-over-year to $23.1 billion. "
+            "The office cafeteria introduced a new lunch menu. "
+            "AWS launched new AI services for Amazon Bedrock customers. "
+            "Parking spaces were repainted over the weekend. "
+            "AWS expanded infrastructure with new regions in Asia. "
+            "Competition from Azure and Google Cloud challenges AWS revenue growth."
+        )
+
+    def test_keeps_ratio_in_original_order(self):
+        """Test that the top sentences are kept in document order"""
+        compressor = ExtractiveCompressor(ratios={'short_summary': 0.5})
+        result = compressor.compress(self.document, 'short_summary')
+
+        self.assertNotIn("cafeteria", result)
+        self.assertNotIn("Parking", result)
+        self.assertLess(result.index("revenue grew"), result.index("regions"))
+
+    def test_textrank_method(self):
+        """Test TextRank scoring produces a shorter document"""
+        compressor = ExtractiveCompressor(method='textrank')
+        result = compressor.compress(self.document, 'one_sentence_summary')
+
+        self.assertLess(len(result), len(self.document))
+        self.assertIn("AWS", result)
+
+    def test_token_budget(self):
+        """Test token budget limits the kept text"""
+        compressor = ExtractiveCompressor(token_budget=30)
+        result = compressor.compress(self.document)
+
+        self.assertLessEqual(len(result) // 4, 30)
+
+    def test_token_budget_respects_disabled_types(self):
+        """Test a None ratio disables compression even under a budget"""
+        compressor = ExtractiveCompressor(token_budget=20)
+
+        self.assertEqual(compressor.compress(self.document, 'topic_focused_summary'),
+                         self.document)
+        self.assertNotIn("Parking", compressor.compress(self.document, 'short_summary'))
+
+    def test_disabled_types_untouched(self):
+        """Test summary types without a ratio are not compressed"""
+        compressor = ExtractiveCompressor()
+
+        self.assertEqual(compressor.compress(self.document, 'topic_focused_summary'),
+                         self.document)
+        self.assertEqual(compressor.compress("Too short. To compress.", 'short_summary'),
+                         "Too short. To compress.")
+
+    @patch('boto3.client')
+    def test_summarizer_sends_compressed_prompt(self, mock_boto_client):
+        """Test the summarizer applies compression before rendering"""
+        mock_response = {
+            'body': MagicMock()
+        }
+        mock_response['body'].read.return_value = json.dumps({
+            'content': [{'text': 'AWS grew.'}]
+        }).encode()
+
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = mock_response
+        mock_boto_client.return_value = mock_client
+
+        summarizer = DocumentSummarizer(compressor=ExtractiveCompressor())
+        summarizer.short_summary(self.document)
+
+        body = json.loads(mock_client.invoke_model.call_args.kwargs['body'])
+        prompt = body['messages'][0]['content']
+        self.assertNotIn("cafeteria", prompt)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Unit tests for BudgetGovernor
+"""
+
+import unittest
+from unittest.mock import Mock, patch, MagicMock
+import json
+import os
+import tempfile
+from botocore.exceptions import ClientError
+from governor import BudgetGovernor, FileLedgerStore, InMemoryLedgerStore, LedgerStore
+from summarizer import DocumentSummarizer
+
+
+class FakeClock:
+    """Manually advanced clock; sleeping advances time"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestBudgetGovernor(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a governor with a fake clock"""
+        self.clock = FakeClock()
+        self.governor = BudgetGovernor(
+            requests_per_minute=10, tokens_per_minute=1000,
+            store=InMemoryLedgerStore(), reserve_fraction=0.2,
+            clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_normal_priority_waits_for_window(self):
+        """Test normal callers wait once their share is used"""
+        self.governor.acquire(800)
+        self.governor.acquire(100)
+
+        self.assertEqual(self.clock.now, 1060.0)
+        self.assertEqual(self.governor.usage(), {'requests': 1, 'tokens': 100})
+
+    def test_high_priority_uses_reserved_headroom(self):
+        """Test high priority callers may use the reserve"""
+        self.governor.acquire(800)
+        self.governor.acquire(200, priority='high')
+
+        self.assertEqual(self.clock.now, 1000.0)
+
+    def test_settle_and_timeout(self):
+        """Test settling frees budget and timeouts raise"""
+        reservation = self.governor.acquire(800)
+        with self.assertRaises(TimeoutError):
+            self.governor.acquire(100, timeout=5)
+
+        self.governor.settle(reservation, 300)
+        self.governor.acquire(100)
+        self.assertEqual(self.governor.usage()['tokens'], 400)
+
+    def test_file_ledger_shared_between_instances(self):
+        """Test two governors on one ledger file see each other's usage"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ledger.json')
+            first = BudgetGovernor(10, 1000, store=FileLedgerStore(path),
+                                   clock=self.clock)
+            second = BudgetGovernor(10, 1000, store=FileLedgerStore(path),
+                                    clock=self.clock)
+            first.acquire(250)
+
+            self.assertEqual(second.usage(), {'requests': 1, 'tokens': 250})
+
+    def test_incomplete_store_fails_on_creation(self):
+        """Test a ledger backend without transaction() cannot be created"""
+        class IncompleteStore(LedgerStore):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteStore()
+
+    @patch('boto3.client')
+    def test_summarizer_settles_actual_usage(self, mock_boto_client):
+        """Test the summarizer reserves budget and settles reported usage"""
+        mock_response = {
+            'body': MagicMock()
+        }
+        mock_response['body'].read.return_value = json.dumps({
+            'content': [{'text': 'AWS grew.'}],
+            'usage': {'input_tokens': 40, 'output_tokens': 5}
+        }).encode()
+
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = mock_response
+        mock_boto_client.return_value = mock_client
+
+        summarizer = DocumentSummarizer(governor=self.governor)
+        summarizer.short_summary("AWS revenue grew 12% year-over-year.")
+
+        self.assertEqual(self.governor.usage(), {'requests': 1, 'tokens': 45})
+
+    @patch('boto3.client')
+    def test_failed_call_releases_reserved_tokens(self, mock_boto_client):
+        """Test a failing call keeps its request but frees its tokens"""
+        mock_client = Mock()
+        mock_client.invoke_model.side_effect = Exception("ThrottlingException")
+        mock_boto_client.return_value = mock_client
+
+        summarizer = DocumentSummarizer(governor=self.governor)
+        with self.assertRaises(Exception):
+            summarizer.short_summary("AWS revenue grew 12% year-over-year.")
+
+        self.assertEqual(self.governor.usage(), {'requests': 1, 'tokens': 0})
+
+    @patch('boto3.client')
+    def test_throttled_calls_retry_through_ledger(self, mock_boto_client):
+        """Test botocore retries are off and each retry is recorded"""
+        throttled = ClientError({'Error': {'Code': 'ThrottlingException',
+                                           'Message': 'Rate exceeded'}}, 'InvokeModel')
+        mock_response = {'body': MagicMock()}
+        mock_response['body'].read.return_value = json.dumps({
+            'content': [{'text': 'AWS grew.'}],
+            'usage': {'input_tokens': 40, 'output_tokens': 5}
+        }).encode()
+
+        mock_client = Mock()
+        mock_client.invoke_model.side_effect = [throttled, throttled, mock_response]
+        mock_boto_client.return_value = mock_client
+
+        summarizer = DocumentSummarizer(governor=self.governor)
+        result = summarizer.short_summary("AWS revenue grew 12% year-over-year.")
+
+        config = mock_boto_client.call_args.kwargs['config']
+        self.assertEqual(config.retries['max_attempts'], 1)
+        self.assertEqual(result, 'AWS grew.')
+        self.assertEqual(self.governor.usage(), {'requests': 3, 'tokens': 45})
+
+        # Retries stop after max_retries attempts
+        mock_client.invoke_model.side_effect = throttled
+        summarizer = DocumentSummarizer(governor=self.governor, max_retries=1)
+        with self.assertRaises(Exception):
+            summarizer.short_summary("AWS revenue grew 12% year-over-year.")
+        self.assertEqual(mock_client.invoke_model.call_count, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
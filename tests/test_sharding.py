@@ -0,0 +1,145 @@
+"""
+Unit tests for batch sharding and merging
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import json
+import tempfile
+from pathlib import Path
+from click.testing import CliRunner
+from sharding import iter_documents, iter_shard, merge_shards, parse_shard, shard_of
+import cli
+
+
+class TestSharding(unittest.TestCase):
+
+    def setUp(self):
+        """Create a small nested corpus"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / 'docs'
+        for name in ['a.txt', 'b.txt', 'sub/c.txt', 'sub/deep/d.txt', 'notes.md']:
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"Document {name}.")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_shard(self):
+        """Test shard specification parsing"""
+        self.assertEqual(parse_shard('1/4'), (1, 4))
+        for spec in ['4/4', '-1/2', 'x', '1/0']:
+            with self.assertRaises(ValueError):
+                parse_shard(spec)
+
+    def test_discovery(self):
+        """Test flat and recursive discovery"""
+        flat = [p.name for p in iter_documents(self.root)]
+        nested = [p.name for p in iter_documents(self.root, recursive=True)]
+
+        self.assertEqual(flat, ['a.txt', 'b.txt'])
+        self.assertEqual(nested, ['a.txt', 'b.txt', 'c.txt', 'd.txt'])
+
+    def test_shards_partition_corpus(self):
+        """Test every file lands in exactly one shard, stably"""
+        shards = [list(iter_shard(self.root, i, 3, recursive=True)) for i in range(3)]
+        combined = sorted(p for shard in shards for p in shard)
+
+        self.assertEqual(combined, sorted(iter_documents(self.root, recursive=True)))
+        self.assertEqual(shard_of('sub/c.txt', 3), shard_of('sub/c.txt', 3))
+
+    @patch('cli.build_summarizer')
+    def test_sharded_batch_and_merge(self, mock_build):
+        """Test sharded batch runs merge into one report"""
+        summarizer = Mock()
+        summarizer.short_summary.return_value = 'Summary.'
+        mock_build.return_value = summarizer
+
+        config = Path(self.tmp.name) / 'config.json'
+        config.write_text('{}')
+        runner = CliRunner()
+        out_dirs = []
+        for i in range(2):
+            out_dir = Path(self.tmp.name) / f'out{i}'
+            result = runner.invoke(cli.cli, [
+                'batch', '-i', str(self.root), '-o', str(out_dir),
+                '-c', str(config), '--shard', f'{i}/2', '--recursive'
+            ])
+            self.assertEqual(result.exit_code, 0, result.output)
+            out_dirs.append(out_dir)
+
+        merged = Path(self.tmp.name) / 'merged'
+        results = merge_shards(out_dirs, merged)
+
+        self.assertEqual([r['file'] for r in results],
+                         ['a.txt', 'b.txt', 'sub/c.txt', 'sub/deep/d.txt'])
+        self.assertTrue((merged / 'sub/deep/d_summary.txt').exists())
+        report = json.loads((merged / 'batch_report.json').read_text())
+        self.assertEqual(len(report), 4)
+
+    @patch('cli.build_summarizer')
+    def test_batch_runs_without_config_file(self, mock_build):
+        """Test batch falls back to built-in defaults when no config is given"""
+        mock_build.return_value.short_summary.return_value = 'Summary.'
+        out_dir = Path(self.tmp.name) / 'out'
+
+        result = CliRunner().invoke(cli.cli, [
+            'batch', '-i', str(self.root), '-o', str(out_dir), '--recursive'
+        ])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(mock_build.call_args.args[0], {})
+
+    def _run_batch(self, out_name, *args):
+        config = Path(self.tmp.name) / 'config.json'
+        config.write_text('{}')
+        out_dir = Path(self.tmp.name) / out_name
+        result = CliRunner().invoke(cli.cli, [
+            'batch', '-i', str(self.root), '-o', str(out_dir), '-c', str(config),
+            '--recursive', *args
+        ])
+        self.assertEqual(result.exit_code, 0, result.output)
+        return out_dir
+
+    @patch('cli.build_summarizer')
+    def test_merge_rejects_incomplete_shard_sets(self, mock_build):
+        """Test missing, duplicated and mixed shard counts are caught"""
+        mock_build.return_value.short_summary.return_value = 'Summary.'
+        out0 = self._run_batch('out0', '--shard', '0/2')
+        other = self._run_batch('other', '--shard', '1/3')
+        merged = Path(self.tmp.name) / 'merged'
+
+        for dirs, message in [([out0], 'missing shards 1 of 2'),
+                              ([out0, out0], 'more than once'),
+                              ([out0, other], 'different shard counts')]:
+            with self.assertRaisesRegex(ValueError, message):
+                merge_shards(dirs, merged)
+
+        result = CliRunner().invoke(cli.cli, ['merge', str(out0), '-o', str(merged)])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn('missing shards 1 of 2', result.output)
+
+        result = CliRunner().invoke(cli.cli, ['merge', str(out0), '-o', str(merged),
+                                              '--allow-incomplete'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('WARNING: missing shards 1 of 2', result.output)
+
+    @patch('cli.build_summarizer')
+    def test_merge_unsharded_run(self, mock_build):
+        """Test an unsharded run's plain report counts as shard 0/1"""
+        mock_build.return_value.short_summary.return_value = 'Summary.'
+        out = self._run_batch('out')
+
+        results = merge_shards([out], Path(self.tmp.name) / 'merged')
+        self.assertEqual(len(results), 4)
+
+        # Re-merging into a shard directory ignores the earlier merged report
+        shard0 = self._run_batch('s0', '--shard', '0/2')
+        shard1 = self._run_batch('s1', '--shard', '1/2')
+        merge_shards([shard0, shard1], shard0)
+        self.assertEqual(len(merge_shards([shard0, shard1], shard0)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for Tracer and batch profiling
+"""
+
+import unittest
+from unittest.mock import Mock, patch, MagicMock
+import json
+import tempfile
+from pathlib import Path
+from click.testing import CliRunner
+from tracing import Tracer
+import cli
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_spans_attributed_to_document(self):
+        """Test spans inside a document carry its id"""
+        tracer = Tracer()
+        with tracer.document('a.txt'):
+            with tracer.span('read'):
+                pass
+
+        names = [(e['name'], e['args'].get('document')) for e in tracer.events]
+        self.assertEqual(names, [('read', 'a.txt'), ('document', 'a.txt')])
+
+    def test_unsampled_documents_record_nothing(self):
+        """Test sampling is decided per document"""
+        tracer = Tracer(sample_rate=0.0)
+        with tracer.document('a.txt'):
+            with tracer.span('read'):
+                pass
+
+        self.assertEqual(tracer.events, [])
+
+    def test_export_chrome_trace(self):
+        """Test export writes Chrome trace JSON with thread names"""
+        tracer = Tracer()
+        with tracer.span('render'):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'trace.json'
+            tracer.export_chrome_trace(str(path))
+            trace = json.loads(path.read_text())
+
+        phases = [e['ph'] for e in trace['traceEvents']]
+        self.assertEqual(phases, ['M', 'X'])
+        self.assertGreaterEqual(trace['traceEvents'][1]['dur'], 0)
+
+    @patch('boto3.client')
+    def test_batch_profile_writes_trace_and_cprofile(self, mock_boto_client):
+        """Test --profile records every stage of each document"""
+        mock_response = {
+            'body': MagicMock()
+        }
+        mock_response['body'].read.return_value = json.dumps({
+            'content': [{'text': 'Summary.'}]
+        }).encode()
+
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = mock_response
+        mock_boto_client.return_value = mock_client
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'docs').mkdir()
+            (root / 'docs' / 'a.txt').write_text("AWS revenue grew.")
+            (root / 'config.json').write_text('{}')
+            prefix = root / 'run'
+
+            result = CliRunner().invoke(cli.cli, [
+                'batch', '-i', str(root / 'docs'), '-o', str(root / 'out'),
+                '-c', str(root / 'config.json'), '--profile', str(prefix)
+            ])
+
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertTrue(Path(f"{prefix}.prof").exists())
+            trace = json.loads(Path(f"{prefix}.trace.json").read_text())
+
+        stages = {e['name'] for e in trace['traceEvents'] if e['ph'] == 'X'}
+        self.assertEqual(stages, {'document', 'read', 'render', 'serialize',
+                                  'network', 'parse', 'write'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Lightweight text helpers shared by the summarization pipeline
+"""
+
+import re
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, keeping their original wording"""
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split text into non-empty paragraphs separated by blank lines"""
+    return [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for scoring and similarity"""
+    return _WORD.findall(text.lower())
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough model token estimate (~4 characters per token)
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count (at least 1 for non-empty text)
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // 4)
+
+
+class SparseRows:
+    """
+    Minimal compressed-sparse-row matrix with one row per text
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray,
+                 data: np.ndarray, n_cols: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, n_cols)
+
+    def _row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def dot_vector(self, vector: np.ndarray) -> np.ndarray:
+        """Product with a dense column vector of length n_cols"""
+        return np.bincount(self._row_ids(), weights=self.data * vector[self.indices],
+                           minlength=self.shape[0])
+
+    def mean(self) -> np.ndarray:
+        """Dense mean of all rows"""
+        if self.shape[0] == 0:
+            return np.zeros(self.shape[1])
+        return np.bincount(self.indices, weights=self.data,
+                           minlength=self.shape[1]) / self.shape[0]
+
+    def toarray(self) -> np.ndarray:
+        """Dense copy (only for small matrices such as one document's sentences)"""
+        dense = np.zeros(self.shape)
+        dense[self._row_ids(), self.indices] = self.data
+        return dense
+
+    def project(self, dimensions: int = 256, seed: int = 0) -> np.ndarray:
+        """
+        Hashed random projection to a fixed number of dimensions
+
+        Each feature is assigned a random bucket and sign (a count sketch),
+        which preserves inner products in expectation using O(nnz) work.
+
+        Args:
+            dimensions: Output dimensionality
+            seed: Random seed for the feature hashing
+
+        Returns:
+            L2-normalized dense array of shape (rows, dimensions)
+        """
+        rng = np.random.default_rng(seed)
+        buckets = rng.integers(dimensions, size=self.shape[1])
+        signs = rng.choice([-1.0, 1.0], size=self.shape[1])
+
+        projected = np.zeros((self.shape[0], dimensions))
+        np.add.at(projected, (self._row_ids(), buckets[self.indices]),
+                  signs[self.indices] * self.data)
+
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return projected / norms
+
+
+def tfidf_vectors(texts: List[str], min_df: int = 1, max_df: float = 1.0,
+                  max_features: Optional[int] = None) -> SparseRows:
+    """
+    Build sparse L2-normalized TF-IDF vectors with one row per text
+
+    Args:
+        texts: Texts to vectorize
+        min_df: Drop terms appearing in fewer texts than this
+        max_df: Drop terms appearing in more than this fraction of texts
+        max_features: Keep only this many terms, by document frequency
+
+    Returns:
+        SparseRows of shape (len(texts), kept vocabulary size)
+    """
+    vocab = {}
+    terms, counts, lengths = [], [], []
+    for text in texts:
+        term_counts = Counter(tokenize(text))
+        terms.extend(vocab.setdefault(t, len(vocab)) for t in term_counts)
+        counts.extend(term_counts.values())
+        lengths.append(len(term_counts))
+
+    n = len(texts)
+    terms = np.array(terms, dtype=np.int64)
+    counts = np.array(counts, dtype=np.float64)
+    row_ids = np.repeat(np.arange(n), lengths)
+
+    df = np.bincount(terms, minlength=len(vocab))
+    keep = (df >= min_df) & (df <= max_df * n)
+    if max_features is not None and keep.sum() > max_features:
+        candidates = np.flatnonzero(keep)
+        top = candidates[np.argsort(-df[candidates], kind='stable')[:max_features]]
+        keep = np.zeros_like(keep)
+        keep[top] = True
+    new_ids = np.cumsum(keep) - 1
+
+    mask = keep[terms]
+    terms, counts, row_ids = terms[mask], counts[mask], row_ids[mask]
+    idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+    data = np.log1p(counts) * idf[terms]
+
+    norms = np.sqrt(np.bincount(row_ids, weights=data ** 2, minlength=n))
+    norms[norms == 0] = 1.0
+    data /= norms[row_ids]
+
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(row_ids, minlength=n))])
+    return SparseRows(indptr, new_ids[terms], data, int(keep.sum()))
+
+
+def text_similarity(a: str, b: str) -> float:
+    """Cosine similarity of two texts in a shared TF-IDF space"""
+    matrix = tfidf_vectors([a, b]).toarray()
+    return float(matrix[0] @ matrix[1])
@@ -0,0 +1,120 @@
+"""
+Per-document hot-path tracing with Chrome trace / Perfetto export
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+
+class Tracer:
+    """
+    Records timed spans for each stage of each document
+
+    Sampling is decided once per document so a sampled document has all of
+    its spans. Spans outside a document context are sampled individually.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, seed: Optional[int] = None):
+        """
+        Initialize the tracer
+
+        Args:
+            sample_rate: Fraction of documents to trace (0-1)
+            seed: Random seed for reproducible sampling (optional)
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+        self._origin = time.perf_counter()
+        self._events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _sample(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.sample_rate
+
+    @contextmanager
+    def document(self, doc_id: str):
+        """
+        Attribute spans in this block (and thread) to a document
+
+        Args:
+            doc_id: Identifier shown in the trace, e.g. the file name
+        """
+        previous = getattr(self._local, 'document', None)
+        self._local.document = (doc_id, self._sample())
+        try:
+            with self.span('document'):
+                yield
+        finally:
+            self._local.document = previous
+
+    def span(self, name: str, **args):
+        """
+        Time a stage of work
+
+        Args:
+            name: Stage name (e.g. "read", "render", "network")
+            **args: Extra details attached to the trace event
+
+        Returns:
+            Context manager recording the span when sampled
+        """
+        current = getattr(self._local, 'document', None)
+        sampled = current[1] if current else self._sample()
+        if not sampled:
+            return nullcontext()
+        if current:
+            args['document'] = current[0]
+        return self._record(name, args)
+
+    @contextmanager
+    def _record(self, name: str, args: dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                'name': name,
+                'cat': 'summarizer',
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args
+            }
+            with self._lock:
+                self._events.append(event)
+
+    @property
+    def events(self) -> list:
+        """Recorded trace events"""
+        with self._lock:
+            return list(self._events)
+
+    def export_chrome_trace(self, path: str):
+        """
+        Write recorded spans as Chrome trace JSON (opens in Perfetto)
+
+        Args:
+            path: Output file path
+        """
+        events = self.events
+        names = {t.ident: t.name for t in threading.enumerate()}
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+             'args': {'name': names.get(tid, f'thread-{tid}')}}
+            for tid in sorted({e['tid'] for e in events})
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + events,
+                       'displayTimeUnit': 'ms'}, f)